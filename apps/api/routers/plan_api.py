@@ -1,7 +1,7 @@
 """
 Route Planning API Router
 """
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from pathlib import Path
 import json
 from datetime import datetime
@@ -38,6 +38,9 @@ def run_plan(request: PlanRequest, current_user: UserInDB = Depends(set_user_con
     - data/workspace/{workspace}/output/{STATE}/route_plan_{timestamp}.json
     
     JSON includes metadata wrapper with request parameters and planning results.
+    
+    The response body is serialized once by Pydantic's Rust core and returned
+    directly, so FastAPI does not re-validate and re-encode the PlanResult.
     """
     logger = logging.getLogger(__name__)
     
@@ -60,6 +63,9 @@ def run_plan(request: PlanRequest, current_user: UserInDB = Depends(set_user_con
     result = plan(request)
     logger.info(f"Planning completed! Total routes: {len(result.team_days)}")
     
+    # Serialize once; reused for the saved file, progress sync and the response
+    result_data = result.model_dump(mode='json', warnings=False)
+    
     # Save results to workspace output folder organized by state
     if request.workspace and request.state_abbr:
         from planning_engine.core.workspace import get_workspace_path
@@ -86,7 +92,7 @@ def run_plan(request: PlanRequest, current_user: UserInDB = Depends(set_user_con
                 "max_route_minutes": request.max_route_minutes,
                 "service_minutes_per_site": request.service_minutes_per_site
             },
-            "result": result.model_dump(mode='json', warnings=False)
+            "result": result_data
         }
         
         # Save complete JSON output with metadata
@@ -118,10 +124,10 @@ def run_plan(request: PlanRequest, current_user: UserInDB = Depends(set_user_con
                 print(f"✓ Progress tracking initialized: {sites_added} new sites added")
             
             # Sync crew assignments from planning results
-            updated_count = sync_progress_with_plan_result(request.workspace, result.model_dump())
+            updated_count = sync_progress_with_plan_result(request.workspace, result_data)
             if updated_count > 0:
                 print(f"✓ Progress updated: {updated_count} sites assigned to crews")
         except Exception as e:
             print(f"⚠ Warning: Could not update progress tracking: {e}")
     
-    return result
+    return Response(content=result.model_dump_json(warnings=False), media_type="application/json")
@@ -234,7 +234,7 @@ def main():
     
     # Save complete JSON output with all data
     output_file_json = output_dir / "route_plan.json"
-    result_dict = result.model_dump()  # Convert Pydantic model to dict
+    result_dict = result.model_dump(mode='json', warnings=False)  # JSON-ready dict (dates as ISO strings)
     with open(output_file_json, 'w') as f:
         json.dump(result_dict, f, indent=2)
     
@@ -0,0 +1,42 @@
+"""Named process pools shared across planning requests."""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict
+
+_executors: Dict[str, ProcessPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_spawn_executor(name: str, workers: int) -> ProcessPoolExecutor:
+    """Get the shared spawn process pool registered under name, creating it on first use.
+
+    Spawning a worker imports OR-Tools, pandas and the planning engine, which
+    takes about a second, so workers are kept alive across requests instead of
+    paying that startup every time. spawn rather than fork avoids copying a
+    parent that may hold OR-Tools or server threads.
+
+    Args:
+        name: Pool name; each caller keeps its own pool
+        workers: Pool size to use if the pool has to be created
+
+    Returns:
+        The shared ProcessPoolExecutor
+    """
+    with _executors_lock:
+        executor = _executors.get(name)
+        if executor is None:
+            executor = _executors[name] = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return executor
+
+
+def reset_spawn_executor(name: str) -> None:
+    """Drop a broken shared pool so the next get_spawn_executor() starts a fresh one."""
+    with _executors_lock:
+        executor = _executors.pop(name, None)
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
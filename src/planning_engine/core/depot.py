@@ -6,6 +6,7 @@ Routes start at the first site and end at the last site.
 """
 
 from typing import List
+import numpy as np
 from ..models import Site
 
 
@@ -34,8 +35,9 @@ def create_virtual_depot(sites: List[Site]) -> Site:
             index=0
         )
     
-    avg_lat = sum(s.lat for s in sites) / len(sites)
-    avg_lon = sum(s.lon for s in sites) / len(sites)
+    # One pass over the sites; NumPy averages both columns together
+    coords = np.array([(s.lat, s.lon) for s in sites], dtype=np.float64)
+    avg_lat, avg_lon = coords.mean(axis=0).tolist()
     
     return Site(
         id="DEPOT",
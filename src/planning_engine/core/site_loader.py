@@ -21,10 +21,14 @@ def _build_address_from_row(row: pd.Series) -> str:
 
 
 def _create_site_from_row(row: pd.Series, service_minutes: int) -> Site:
-    """Create a Site object from a CSV row."""
+    """Create a Site object from a CSV row.
+    
+    Values are coerced to their field types here, so the Site is built with
+    model_construct and skips Pydantic validation for each loaded row.
+    """
     full_address = _build_address_from_row(row)
     
-    return Site(
+    return Site.model_construct(
         id=str(row['site_id']),
         name=f"{row['city']} - {row['street1']}",
         lat=float(row['lat']),
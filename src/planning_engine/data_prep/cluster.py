@@ -4,6 +4,9 @@ from sklearn.cluster import KMeans
 from sklearn.metrics import silhouette_score
 from typing import Tuple
 
+# Rows per block when computing pairwise distances for cluster diameters
+_DIAMETER_BLOCK_ROWS = 1024
+
 
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
@@ -43,14 +46,19 @@ def calculate_cluster_diameter(coordinates: np.ndarray) -> float:
     if len(coordinates) <= 1:
         return 0.0
     
+    lat = coordinates[:, 0].astype(float)
+    lon = coordinates[:, 1].astype(float)
+    
+    # Broadcast one block of rows against all points at a time, so all pairs
+    # are evaluated by NumPy while memory stays bounded for large clusters
     max_distance = 0.0
-    for i in range(len(coordinates)):
-        for j in range(i + 1, len(coordinates)):
-            dist = haversine_distance(
-                coordinates[i, 0], coordinates[i, 1],
-                coordinates[j, 0], coordinates[j, 1]
-            )
-            max_distance = max(max_distance, dist)
+    for start in range(0, len(coordinates), _DIAMETER_BLOCK_ROWS):
+        stop = start + _DIAMETER_BLOCK_ROWS
+        distances = haversine_distance(
+            lat[start:stop, None], lon[start:stop, None],
+            lat[None, :], lon[None, :]
+        )
+        max_distance = max(max_distance, float(distances.max()))
     
     return max_distance
 
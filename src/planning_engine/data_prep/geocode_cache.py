@@ -5,21 +5,75 @@ This module provides a cross-platform (Mac, Windows, Linux) geocoding cache
 that is shared across all users to reduce API costs and improve performance.
 """
 
+import atexit
 import sqlite3
 import hashlib
 import threading
+import functools
+import weakref
 from pathlib import Path
 from typing import Optional, List, Dict, Tuple
 from contextlib import contextmanager
 from datetime import datetime
 
 
+# Statements are kept as module constants so every call passes the identical
+# SQL text and hits sqlite3's per-connection prepared statement cache.
+_SELECT_SQL = """
+    SELECT latitude, longitude, formatted_address, street1, city, state, zip
+    FROM geocode_cache
+    WHERE address_hash = ?
+"""
+
+_TOUCH_SQL = """
+    UPDATE geocode_cache
+    SET last_accessed = CURRENT_TIMESTAMP,
+        access_count = access_count + 1
+    WHERE address_hash = ?
+"""
+
+_INSERT_SQL = """
+    INSERT INTO geocode_cache 
+    (address_hash, street1, city, state, zip, latitude, longitude, formatted_address)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_UPDATE_SQL = """
+    UPDATE geocode_cache
+    SET latitude = ?, longitude = ?, formatted_address = ?,
+        last_accessed = CURRENT_TIMESTAMP,
+        access_count = access_count + 1
+    WHERE address_hash = ?
+"""
+
+# Prepared statements retained per connection (sqlite3 defaults to 128)
+_CACHED_STATEMENTS = 256
+
+# Rows written between WAL checkpoints; keeps the -wal file from growing
+# without bound during large geocoding runs
+_CHECKPOINT_INTERVAL = 10_000
+
+# Caches still holding connections; closed once at interpreter exit. A weak
+# set, so registering a cache doesn't keep it alive until exit.
+_open_caches: "weakref.WeakSet[GeocodeCache]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_caches():
+    """Refresh planner statistics and release connections at interpreter exit."""
+    for cache in list(_open_caches):
+        cache.close()
+
+
 class GeocodeCache:
     """
     Thread-safe SQLite-based geocoding cache shared across all users.
     
     The cache stores geocoded addresses with normalized keys to handle
     slight variations in address formatting.
+    
+    Each thread keeps one persistent connection, so compiled statements are
+    reused across calls instead of being re-prepared on a fresh connection.
     """
     
     def __init__(self, db_path: Path):
@@ -32,7 +86,11 @@ class GeocodeCache:
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._lock = threading.Lock()
+        self._local = threading.local()
+        self._connections: Dict[threading.Thread, sqlite3.Connection] = {}
+        self._writes_since_checkpoint: int = 0
         self._init_db()
+        _open_caches.add(self)
     
     def _init_db(self):
         """Initialize the database schema if it doesn't exist."""
@@ -68,15 +126,64 @@ class GeocodeCache:
     
     @contextmanager
     def _get_connection(self):
-        """Get a database connection with proper error handling."""
-        conn = sqlite3.connect(str(self.db_path), timeout=30.0)
-        conn.row_factory = sqlite3.Row
+        """Get this thread's database connection, rolling back on error."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # check_same_thread=False only so close() and the cleanup below can
+            # run from another thread; each connection is used by its own thread.
+            conn = sqlite3.connect(
+                str(self.db_path),
+                timeout=30.0,
+                cached_statements=_CACHED_STATEMENTS,
+                check_same_thread=False,
+            )
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+            with self._lock:
+                # Server worker threads exit when idle and are replaced, so
+                # close connections left behind by threads that have finished
+                dead = [t for t in self._connections if not t.is_alive()]
+                stale = [self._connections.pop(t) for t in dead]
+                self._connections[threading.current_thread()] = conn
+            for old in stale:
+                old.close()
         try:
             yield conn
-        finally:
+        except Exception:
+            conn.rollback()
+            raise
+    
+    def _record_writes(self, conn: sqlite3.Connection, count: int):
+        """
+        Track committed writes and checkpoint the WAL once enough accumulate.
+        
+        Args:
+            conn: Connection that performed the writes
+            count: Number of rows written
+        """
+        with self._lock:
+            self._writes_since_checkpoint += count
+            if self._writes_since_checkpoint < _CHECKPOINT_INTERVAL:
+                return
+            self._writes_since_checkpoint = 0
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    
+    def close(self):
+        """Close all connections opened by this cache, running PRAGMA optimize first."""
+        _open_caches.discard(self)
+        with self._lock:
+            connections, self._connections = self._connections, {}
+        for conn in connections.values():
+            try:
+                conn.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass  # Best-effort maintenance; never block shutdown
             conn.close()
+        self._local = threading.local()
     
-    def _normalize_address(self, street: str, city: str, state: str, zip_code: Optional[str] = None) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=100_000)
+    def _normalize_address(street: str, city: str, state: str, zip_code: Optional[str] = None) -> str:
         """
         Normalize address for consistent hashing.
         
@@ -85,6 +192,9 @@ class GeocodeCache:
         - Extra whitespace
         - Common abbreviations
         
+        Results are memoized per process since the same addresses are looked
+        up repeatedly (duplicate input rows, re-geocoding a workspace).
+        
         Args:
             street: Street address
             city: City name
@@ -106,9 +216,11 @@ class GeocodeCache:
         
         return "|".join(parts)
     
-    def _hash_address(self, street: str, city: str, state: str, zip_code: Optional[str] = None) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=100_000)
+    def _hash_address(street: str, city: str, state: str, zip_code: Optional[str] = None) -> str:
         """
-        Create a hash for address lookup.
+        Create a hash for address lookup (memoized per process).
         
         Args:
             street: Street address
@@ -119,7 +231,7 @@ class GeocodeCache:
         Returns:
             SHA256 hash of normalized address
         """
-        normalized = self._normalize_address(street, city, state, zip_code)
+        normalized = GeocodeCache._normalize_address(street, city, state, zip_code)
         return hashlib.sha256(normalized.encode()).hexdigest()
     
     def get(self, street: str, city: str, state: str, zip_code: Optional[str] = None) -> Optional[Dict]:
@@ -138,21 +250,10 @@ class GeocodeCache:
         addr_hash = self._hash_address(street, city, state, zip_code)
         
         with self._get_connection() as conn:
-            cursor = conn.execute("""
-                SELECT latitude, longitude, formatted_address, street1, city, state, zip
-                FROM geocode_cache
-                WHERE address_hash = ?
-            """, (addr_hash,))
-            
-            row = cursor.fetchone()
+            row = conn.execute(_SELECT_SQL, (addr_hash,)).fetchone()
             if row:
                 # Update access statistics
-                conn.execute("""
-                    UPDATE geocode_cache
-                    SET last_accessed = CURRENT_TIMESTAMP,
-                        access_count = access_count + 1
-                    WHERE address_hash = ?
-                """, (addr_hash,))
+                conn.execute(_TOUCH_SQL, (addr_hash,))
                 conn.commit()
                 
                 return {
@@ -185,22 +286,12 @@ class GeocodeCache:
         
         with self._get_connection() as conn:
             try:
-                conn.execute("""
-                    INSERT INTO geocode_cache 
-                    (address_hash, street1, city, state, zip, latitude, longitude, formatted_address)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (addr_hash, street, city, state, zip_code, lat, lon, formatted_address))
-                conn.commit()
+                conn.execute(_INSERT_SQL, (addr_hash, street, city, state, zip_code, lat, lon, formatted_address))
             except sqlite3.IntegrityError:
                 # Address already exists, update it
-                conn.execute("""
-                    UPDATE geocode_cache
-                    SET latitude = ?, longitude = ?, formatted_address = ?,
-                        last_accessed = CURRENT_TIMESTAMP,
-                        access_count = access_count + 1
-                    WHERE address_hash = ?
-                """, (lat, lon, formatted_address, addr_hash))
-                conn.commit()
+                conn.execute(_UPDATE_SQL, (lat, lon, formatted_address, addr_hash))
+            conn.commit()
+            self._record_writes(conn, 1)
     
     def batch_get(self, addresses: List[Tuple[str, str, str, Optional[str]]]) -> Dict[str, Optional[Dict]]:
         """
@@ -215,13 +306,12 @@ class GeocodeCache:
         if not addresses:
             return {}
         
-        # Generate hashes for all addresses
-        hash_to_addr = {}
-        for street, city, state, zip_code in addresses:
-            addr_hash = self._hash_address(street, city, state, zip_code)
-            hash_to_addr[addr_hash] = (street, city, state, zip_code)
-        
-        hashes = list(hash_to_addr.keys())
+        # Generate hashes once per distinct address; duplicate input rows
+        # map to the same hash and would only repeat hashing and SQL work
+        hashes = list(dict.fromkeys(
+            self._hash_address(street, city, state, zip_code)
+            for street, city, state, zip_code in dict.fromkeys(map(tuple, addresses))
+        ))
         results = {}
         
         with self._get_connection() as conn:
@@ -261,7 +351,7 @@ class GeocodeCache:
                 conn.commit()
         
         # Add None for addresses not found in cache
-        for addr_hash in hash_to_addr:
+        for addr_hash in hashes:
             if addr_hash not in results:
                 results[addr_hash] = None
         
@@ -287,11 +377,7 @@ class GeocodeCache:
                 )
                 
                 try:
-                    conn.execute("""
-                        INSERT INTO geocode_cache 
-                        (address_hash, street1, city, state, zip, latitude, longitude, formatted_address)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
+                    conn.execute(_INSERT_SQL, (
                         addr_hash,
                         result['street'],
                         result['city'],
@@ -303,13 +389,7 @@ class GeocodeCache:
                     ))
                 except sqlite3.IntegrityError:
                     # Address already exists, update it
-                    conn.execute("""
-                        UPDATE geocode_cache
-                        SET latitude = ?, longitude = ?, formatted_address = ?,
-                            last_accessed = CURRENT_TIMESTAMP,
-                            access_count = access_count + 1
-                        WHERE address_hash = ?
-                    """, (
+                    conn.execute(_UPDATE_SQL, (
                         result['lat'],
                         result['lon'],
                         result.get('formatted'),
@@ -317,6 +397,7 @@ class GeocodeCache:
                     ))
             
             conn.commit()
+            self._record_writes(conn, len(geocode_results))
     
     def get_stats(self) -> Dict:
         """
@@ -342,13 +423,13 @@ class GeocodeCache:
             }
 
 
-# Global cache instance
-_cache_instance: Optional[GeocodeCache] = None
-
-
+@functools.lru_cache(maxsize=8)
 def get_cache(cache_dir: Optional[Path] = None) -> GeocodeCache:
     """
-    Get the global geocode cache instance.
+    Get the shared geocode cache instance.
+    
+    Instances are memoized per cache_dir, so the project-root lookup and
+    database initialization run once per process rather than on every call.
     
     Args:
         cache_dir: Optional directory for the cache file. If not provided,
@@ -357,23 +438,18 @@ def get_cache(cache_dir: Optional[Path] = None) -> GeocodeCache:
     Returns:
         GeocodeCache instance
     """
-    global _cache_instance
-    
-    if _cache_instance is None:
-        if cache_dir is None:
-            # Use project root's data directory
-            from planning_engine.paths import get_project_root
-            root = get_project_root()
-            # Store at project root level, not user-scoped
-            # This ensures it's shared across all users
-            if 'data' in str(root):
-                # If we're in a user-scoped path like data/username/
-                # Go up to the actual project root
-                cache_dir = root.parent.parent / "data"
-            else:
-                cache_dir = root / "data"
-        
-        cache_path = cache_dir / "geocode_cache.db"
-        _cache_instance = GeocodeCache(cache_path)
+    if cache_dir is None:
+        # Use project root's data directory
+        from planning_engine.paths import get_project_root
+        root = get_project_root()
+        # Store at project root level, not user-scoped
+        # This ensures it's shared across all users
+        if 'data' in str(root):
+            # If we're in a user-scoped path like data/username/
+            # Go up to the actual project root
+            cache_dir = root.parent.parent / "data"
+        else:
+            cache_dir = root / "data"
     
-    return _cache_instance
+    cache_path = Path(cache_dir) / "geocode_cache.db"
+    return GeocodeCache(cache_path)
@@ -1,5 +1,44 @@
-import pandas as pd
+import csv
+import logging
 from pathlib import Path
+from openpyxl import load_workbook
+
+logger = logging.getLogger(__name__)
+
+
+# Strings pandas.read_excel treats as missing by default; kept so the streamed
+# CSV output matches what the DataFrame-based parser used to write.
+_NA_STRINGS = frozenset({
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+    '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a',
+    'nan', 'null',
+})
+
+
+def _normalize_cell(value):
+    """Convert a raw openpyxl cell value the way pandas.read_excel would."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return None if value in _NA_STRINGS else value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _header_names(header_row: tuple) -> list:
+    """Build column names from the header row, mangling blanks and duplicates like pandas."""
+    names = []
+    seen: dict[str, int] = {}
+    for i, value in enumerate(header_row):
+        name = f"Unnamed: {i}" if value is None else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
 
 
 def parse_excel_to_csv(
@@ -10,10 +49,14 @@ def parse_excel_to_csv(
 ) -> dict[str, Path]:
     """
     Parse an Excel file, rename columns according to mapping, and save to CSV files organized by state.
-    
+
     Sites are grouped by state and written to separate folders:
     - data/workspace/{workspace}/input/{STATE}/addresses.csv
-    
+
+    Rows are streamed from the workbook straight into per-state CSV writers,
+    so memory use is bounded by the number of states rather than the number
+    of rows. Rows without a state value are skipped.
+
     Args:
         file_path: Path to the input Excel file
         output_path: Base path for output (e.g., data/workspace/{workspace}/input/addresses.csv)
@@ -22,88 +65,119 @@ def parse_excel_to_csv(
                        Format: {standard_name: excel_column_name}
                        Example: {"site_id": "Location", "street1": "MyStreet1"}
                        If None, includes all columns with original names.
-        sheet_name: Name of the Excel sheet to parse. If None, uses the first sheet (default pandas behavior).
-        
+        sheet_name: Name of the Excel sheet to parse. If None, uses the first sheet.
+
     Returns:
         Dict mapping state names to their CSV file paths
         Example: {"LA": Path("data/workspace/foobar/input/LA/addresses.csv"), ...}
-        
+
     Raises:
         FileNotFoundError: If the Excel file doesn't exist
         ValueError: If mapped columns don't exist in the Excel file or 'state' column is missing
     """
-    # Read Excel file with openpyxl engine
-    # If sheet_name is None, pandas will read the first sheet by default
-    result = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl')
-    
-    # Handle case where result is a dict (when sheet_name is specified)
-    # In some pandas versions, specifying sheet_name returns a dict
-    if isinstance(result, dict):
-        # Get the first (and should be only) sheet
-        df = list(result.values())[0]
-    else:
-        df = result
-    
-    # If column mapping is specified, validate and rename columns
-    if column_mapping is not None:
-        # Get the Excel column names from the mapping values
-        excel_columns = list(column_mapping.values())
-        
-        # Check if all mapped columns exist in the Excel file
-        missing_columns = set(excel_columns) - set(df.columns)
-        if missing_columns:
-            # Get the filename from the path
-            filename = Path(file_path).name
-            
-            # Build detailed error message showing which field mappings failed
-            error_details = []
-            for standard_field, excel_column in column_mapping.items():
-                if excel_column in missing_columns:
-                    error_details.append(f"'{standard_field}' → '{excel_column}'")
-            
+    # Read-only mode streams rows from the sheet XML instead of loading every cell
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+
+    try:
+        if sheet_name is None:
+            sheet = workbook.worksheets[0]
+        elif sheet_name in workbook.sheetnames:
+            sheet = workbook[sheet_name]
+        else:
+            raise ValueError(f"Worksheet named '{sheet_name}' not found")
+
+        rows = sheet.iter_rows(values_only=True)
+        header_row = next(rows, None)
+        if header_row is None:
+            raise ValueError(f"Excel sheet is empty: {Path(file_path).name}")
+        columns = _header_names(header_row)
+
+        # If column mapping is specified, validate it and project to the mapped columns
+        if column_mapping is not None:
+            # Check if all mapped columns exist in the Excel file
+            missing_columns = set(column_mapping.values()) - set(columns)
+            if missing_columns:
+                # Get the filename from the path
+                filename = Path(file_path).name
+
+                # Build detailed error message showing which field mappings failed
+                error_details = []
+                for standard_field, excel_column in column_mapping.items():
+                    if excel_column in missing_columns:
+                        error_details.append(f"'{standard_field}' → '{excel_column}'")
+
+                raise ValueError(
+                    f"Column mapping error in {filename}: "
+                    f"{', '.join(error_details)} not found. "
+                    f"Available columns in file: {', '.join(sorted(columns))}"
+                )
+
+            # Output columns use standard names, in mapping order
+            output_columns = list(column_mapping.keys())
+            source_positions = [columns.index(excel_column) for excel_column in column_mapping.values()]
+        else:
+            output_columns = columns
+            source_positions = list(range(len(columns)))
+
+        # Validate that 'state' column exists
+        if 'state' not in output_columns:
             raise ValueError(
-                f"Column mapping error in {filename}: "
-                f"{', '.join(error_details)} not found. "
-                f"Available columns in file: {', '.join(sorted(df.columns))}"
+                "Column 'state' is required for organizing sites by state. "
+                "Make sure your column_mapping includes 'state'."
             )
-        
-        # Select only the mapped columns
-        df = df[excel_columns]
-        
-        # Create reverse mapping: excel_column_name -> standard_name
-        reverse_mapping = {v: k for k, v in column_mapping.items()}
-        
-        # Rename columns to standard names
-        df = df.rename(columns=reverse_mapping)
-    
-    # Validate that 'state' column exists
-    if 'state' not in df.columns:
-        raise ValueError(
-            "Column 'state' is required for organizing sites by state. "
-            "Make sure your column_mapping includes 'state'."
-        )
-    
-    # Get base directory (parent of the output_path)
-    base_output = Path(output_path)
-    base_dir = base_output.parent
-    
-    # Group by state and save each state to its own folder
-    state_files = {}
-    states = df['state'].unique()
-    
-    for state in states:
-        # Filter data for this state
-        state_df = df[df['state'] == state]
-        
-        # Create state-specific directory
-        state_dir = base_dir / str(state)
-        state_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Save to state-specific CSV file
-        state_file = state_dir / "addresses.csv"
-        state_df.to_csv(state_file, index=False)
-        
-        state_files[str(state)] = state_file
-        print(f"  ✓ Saved {len(state_df)} sites for state '{state}' to {state_file}")
-    
+        state_position = output_columns.index('state')
+
+        # Get base directory (parent of the output_path)
+        base_dir = Path(output_path).parent
+
+        # One open file + writer per state, created on first encounter
+        state_files: dict[str, Path] = {}
+        state_counts: dict[str, int] = {}
+        handles = {}
+        writers = {}
+
+        try:
+            for raw_row in rows:
+                row = [
+                    _normalize_cell(raw_row[pos]) if pos < len(raw_row) else None
+                    for pos in source_positions
+                ]
+
+                # Skip blank rows and rows that cannot be assigned to a state
+                state_value = row[state_position]
+                if state_value is None:
+                    continue
+                state = str(state_value)
+
+                writer = writers.get(state)
+                if writer is None:
+                    # Create state-specific directory and CSV file
+                    state_dir = base_dir / state
+                    state_dir.mkdir(parents=True, exist_ok=True)
+                    state_file = state_dir / "addresses.csv"
+
+                    handle = open(state_file, 'w', newline='')
+                    handles[state] = handle
+                    writer = csv.writer(handle, lineterminator='\n')
+                    writer.writerow(output_columns)
+                    writers[state] = writer
+                    state_files[state] = state_file
+                    state_counts[state] = 0
+
+                writer.writerow(['' if value is None else value for value in row])
+                state_counts[state] += 1
+        finally:
+            for handle in handles.values():
+                handle.close()
+    finally:
+        workbook.close()
+
+    logger.info(
+        "Saved %d sites across %d states under %s (%s)",
+        sum(state_counts.values()),
+        len(state_counts),
+        base_dir,
+        ", ".join(f"{state}: {count}" for state, count in state_counts.items()),
+    )
+
     return state_files
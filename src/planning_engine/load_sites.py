@@ -1,11 +1,14 @@
 """Helper functions to load sites from workspace CSV files."""
 
+import logging
 from pathlib import Path
 from typing import List
 import pandas as pd
 from .models import Site
 from .paths import get_workspace_path
 
+logger = logging.getLogger(__name__)
+
 
 def load_sites_from_workspace(
     workspace_name: str, 
@@ -96,36 +99,39 @@ def load_sites_from_workspace(
             f"Found columns: {', '.join(df.columns)}"
         )
     
-    # Build Site objects
-    sites = []
-    for idx, row in df.iterrows():
-        # Use site_id as both id and name (or use street1 if available)
-        site_id = str(row['site_id'])
-        
-        # Try to build a readable name from address fields
-        if 'street1' in df.columns and pd.notna(row.get('street1')):
-            name = str(row['street1'])
-        else:
-            name = site_id
-        
-        # Get service minutes (default to 60 if not specified)
-        service_minutes = 60
-        if 'service_minutes' in df.columns and pd.notna(row.get('service_minutes')):
-            service_minutes = int(row['service_minutes'])
-        
-        # Skip sites with missing lat/lon
-        if pd.isna(row['lat']) or pd.isna(row['lon']):
-            print(f"Warning: Skipping site {site_id} - missing coordinates")
-            continue
-        
-        site = Site(
+    # Skip sites with missing lat/lon, reported once rather than per row
+    missing_coords = df['lat'].isna() | df['lon'].isna()
+    skipped = int(missing_coords.sum())
+    if skipped:
+        logger.warning("Skipped %d sites with missing coordinates in %s", skipped, csv_path)
+        df = df[~missing_coords]
+    
+    # Use site_id as both id and name (or use street1 if available)
+    site_ids = df['site_id'].astype(str)
+    if 'street1' in df.columns:
+        names = df['street1'].astype(str).where(df['street1'].notna(), site_ids)
+    else:
+        names = site_ids
+    
+    # Get service minutes (default to 60 if not specified)
+    if 'service_minutes' in df.columns:
+        service_minutes = df['service_minutes'].fillna(60).astype(int)
+    else:
+        service_minutes = pd.Series(60, index=df.index)
+    
+    # Build Site objects; values are already coerced above, so skip validation
+    sites = [
+        Site.model_construct(
             id=site_id,
             name=name,
-            lat=float(row['lat']),
-            lon=float(row['lon']),
-            service_minutes=service_minutes
+            lat=float(lat),
+            lon=float(lon),
+            service_minutes=int(minutes)
+        )
+        for site_id, name, lat, lon, minutes in zip(
+            site_ids, names, df['lat'], df['lon'], service_minutes
         )
-        sites.append(site)
+    ]
     
     print(f"✓ Loaded {len(sites)} sites from {csv_path}")
     return sites
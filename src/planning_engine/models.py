@@ -1,4 +1,5 @@
-from pydantic import BaseModel, Field, field_serializer
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+import datetime
 from typing import List, Optional
 from datetime import time, date
 
@@ -7,6 +8,9 @@ class Site(BaseModel):
     
     The 'id' field is used by the API for identification.
     The 'index' field is used by OR-Tools solver for routing.
+    
+    Sites are immutable so the same instance can be shared safely across
+    planning days and clusters; use model_copy(update=...) to derive variants.
     """
     id: str
     name: str
@@ -17,6 +21,8 @@ class Site(BaseModel):
     blackout_dates: Optional[List[date]] = None
     index: Optional[int] = None  # Used by OR-Tools solver, set during planning
 
+    model_config = ConfigDict(frozen=True)
+
 class Workday(BaseModel):
     start: time
     end: time
@@ -42,21 +48,18 @@ class TeamDay(BaseModel):
     # Break time allocated for this team-day
     break_minutes: int = 0
     
-    # Optional date field for multi-day scheduling
-    date: Optional[date] = None
+    # Optional date field for multi-day scheduling (annotated via the module,
+    # since the field name shadows the date class inside this class body)
+    date: Optional[datetime.date] = None
     
     # Optional cluster ID for clustered planning (for UI display, 0-based internally)
     cluster_id: Optional[int] = None
     
     # Optional team label for display (e.g., "C1-T1" for cluster 1, team 1)
     team_label: Optional[str] = None
-    
-    @field_serializer('date')
-    def serialize_date(self, dt: Optional[date], _info):
-        """Serialize date to ISO format string."""
-        if dt is None:
-            return None
-        return dt.isoformat()
+
+    # Cluster tag used while renumbering team IDs across clusters (not serialized)
+    _cluster_id: Optional[int] = PrivateAttr(default=None)
     
     model_config = {
         "json_schema_serialization_defaults_required": True,
@@ -103,18 +106,6 @@ class PlanRequest(BaseModel):
     service_minutes_per_site: int = 60
     fast_mode: bool = False  # If True, use faster but less optimal solver settings
 
-    @field_serializer('start_date', 'end_date')
-    def serialize_dates(self, dt: Optional[date], _info):
-        """Serialize date to ISO format string."""
-        if dt is None:
-            return None
-        return dt.isoformat()
-    
-    @field_serializer('holidays')
-    def serialize_holidays(self, dates: List[date], _info):
-        """Serialize list of dates to ISO format strings."""
-        return [d.isoformat() for d in dates]
-
     model_config = {
         "json_schema_extra": {
             "examples": [
@@ -152,13 +143,7 @@ class PlanResult(BaseModel):
     unassigned: int = 0  # number of sites not scheduled
     start_date: Optional[date] = None  # Actual start date used in planning
     end_date: Optional[date] = None  # Calculated end date (for fixed crew mode)
-    
-    @field_serializer('start_date', 'end_date')
-    def serialize_dates(self, dt: Optional[date], _info):
-        """Serialize date to ISO format string."""
-        if dt is None:
-            return None
-        return dt.isoformat()
+
 
 class CalendarPlanResult(BaseModel):
     start_date: date
@@ -169,7 +154,7 @@ class CalendarPlanResult(BaseModel):
     planning_days_used: int
 
     def to_plan_result(self) -> PlanResult:
-        return PlanResult(
+        return PlanResult.model_construct(
             team_days=self.team_days,
             unassigned=self.unassigned,
             start_date=self.start_date,
@@ -199,13 +184,6 @@ class Team(BaseModel):
     notes: str = ""
     created_date: Optional[date] = None
     
-    @field_serializer('availability_start', 'availability_end', 'created_date')
-    def serialize_dates(self, dt: Optional[date], _info):
-        """Serialize date to ISO format string."""
-        if dt is None:
-            return None
-        return dt.isoformat()
-    
     model_config = {
         "json_schema_extra": {
             "examples": [
@@ -250,13 +228,6 @@ class SiteProgress(BaseModel):
     cluster_id: Optional[int] = None  # Cluster assignment for grouping
     last_updated: Optional[str] = None  # ISO timestamp
     
-    @field_serializer('scheduled_date')
-    def serialize_date(self, dt: Optional[date], _info):
-        """Serialize date to ISO format string."""
-        if dt is None:
-            return None
-        return dt.isoformat()
-    
     model_config = {
         "json_schema_extra": {
             "examples": [
@@ -281,13 +252,6 @@ class ProgressBulkUpdate(BaseModel):
     crew_assigned: Optional[str] = None
     notes: Optional[str] = None
     scheduled_date: Optional[date] = None
-    
-    @field_serializer('scheduled_date')
-    def serialize_date(self, dt: Optional[date], _info):
-        """Serialize date to ISO format string."""
-        if dt is None:
-            return None
-        return dt.isoformat()
 
 
 class ProgressInitRequest(BaseModel):
@@ -9,14 +9,20 @@ by setting the _current_username context variable.
 """
 
 from pathlib import Path
+import functools
 import os
+import re
 from contextvars import ContextVar
+from typing import Optional
 
 # Context variable to store current authenticated username
 # When set, workspace paths become: data/{username}/workspace/{workspace_name}
 # When not set, workspace paths remain: data/workspace/{workspace_name}
 _current_username: ContextVar[str] = ContextVar('current_username', default=None)
 
+# Characters not allowed in workspace names (anything but alphanumeric, underscore, hyphen)
+_SANITIZE_RE = re.compile(r'[^a-zA-Z0-9_\-]')
+
 
 def set_current_username(username: str):
     """Set the current username context for user-scoped workspace paths."""
@@ -43,6 +49,43 @@ def get_project_root() -> Path:
     Returns:
         Path to the project root directory (or user-scoped root if username is set)
         
+    Raises:
+        RuntimeError: If project root cannot be found
+    """
+    return _project_root_for(get_current_username())
+
+
+@functools.lru_cache(maxsize=None)
+def _project_root_for(username: Optional[str]) -> Path:
+    """
+    Resolve the (optionally user-scoped) project root once per username.
+    
+    The project root never moves while the process runs, so the filesystem
+    walk only happens on the first call.
+    
+    Args:
+        username: Current username context, or None
+        
+    Returns:
+        data/{username} under the project root if username is set, else the project root
+    """
+    project_root = _find_project_root_uncached()
+    
+    # If username context is set, return user-scoped root: data/{username}
+    if username:
+        return project_root / "data" / username
+    
+    # Otherwise return standard project root
+    return project_root
+
+
+def _find_project_root_uncached() -> Path:
+    """
+    Search upward from this file for the directory containing pyproject.toml.
+    
+    Returns:
+        Path to the project root directory
+        
     Raises:
         RuntimeError: If project root cannot be found
     """
@@ -52,13 +95,9 @@ def get_project_root() -> Path:
     # Search upward for the project root (max 10 levels)
     project_root = None
     for _ in range(10):
-        # Check if this directory contains 'src' folder and 'pyproject.toml'
-        # These are more reliable markers than 'data' which might be created anywhere
-        if (current / "src").exists() and (current / "pyproject.toml").exists():
-            project_root = current
-            break
-        
-        # Also check for pyproject.toml alone as a marker
+        # pyproject.toml marks the root whether or not a 'src' folder sits next to it;
+        # it is a more reliable marker than 'data' which might be created anywhere.
+        # One stat per level is enough.
         if (current / "pyproject.toml").exists():
             project_root = current
             break
@@ -77,12 +116,6 @@ def get_project_root() -> Path:
             f"Searched from {Path(__file__).resolve()} upward."
         )
     
-    # If username context is set, return user-scoped root: data/{username}
-    username = get_current_username()
-    if username:
-        return project_root / "data" / username
-    
-    # Otherwise return standard project root
     return project_root
 
 
@@ -105,15 +138,13 @@ def get_workspace_path(workspace_name: str) -> Path:
     Raises:
         ValueError: If workspace name is empty or invalid
     """
-    import re
-    
     # Validate workspace name is not empty
     if not workspace_name or not workspace_name.strip():
         raise ValueError("Workspace name cannot be empty")
     
     # Remove any path separators and dangerous characters
     # Only allow alphanumeric, underscore, and hyphen (remove dots and slashes entirely)
-    sanitized = re.sub(r'[^a-zA-Z0-9_\-]', '', workspace_name)
+    sanitized = _SANITIZE_RE.sub('', workspace_name)
     
     # Remove leading/trailing underscores and hyphens
     sanitized = sanitized.strip('_-')
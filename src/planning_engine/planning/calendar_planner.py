@@ -1,24 +1,24 @@
 """Fixed calendar planning: find minimum crews needed for a fixed date range."""
 
 from datetime import timedelta, date
-from typing import List
+from typing import Dict, List, Optional
 import math
+import numpy as np
 from ..models import PlanRequest, CalendarPlanResult, Site, TeamDay
-from ..core.depot import create_virtual_depot
-from ..solver.solver_utils import prepare_sites_with_indices, calculate_distance_matrix
-from ..solver.ortools_solver import solve_single_day_vrptw, _convert_solution_to_team_days
-from .crew_planner import _remove_assigned_sites
+from ..solver.solver_utils import site_distance_matrix
+from ..solver.ortools_solver import _convert_solution_to_team_days
+from .crew_planner import _remove_assigned_sites, _solve_remaining_sites
 
 
 def _count_working_days(start: date, end: date, holidays: List[date]) -> int:
-    """Count working days (excluding weekends and holidays) in a date range."""
-    d = start
-    count = 0
-    while d <= end:
-        if d.weekday() < 5 and d not in holidays:  # Not weekend or holiday
-            count += 1
-        d += timedelta(days=1)
-    return count
+    """Count working days (excluding weekends and holidays) in a date range.
+    
+    Uses numpy's business-day calendar (Mon-Fri) so the count is computed in
+    one call instead of stepping through every date. The end date is inclusive.
+    """
+    if end < start:
+        return 0
+    return int(np.busday_count(start, end + timedelta(days=1), holidays=holidays))
 
 
 def _estimate_crews_needed(
@@ -40,15 +40,65 @@ def _estimate_crews_needed(
     return max(1, math.ceil(total_minutes / capacity_per_crew))
 
 
+def _min_travel_into_sites(sites: List[Site], site_matrix: np.ndarray) -> np.ndarray:
+    """
+    Cheapest travel into each site from any other site, sorted ascending.
+    
+    Site-to-site matrix entries include service time at the destination, which
+    is subtracted so only travel remains.
+    """
+    if len(sites) < 2:
+        return np.zeros(0, dtype=np.int64)
+    travel = site_matrix.astype(np.int64)
+    np.fill_diagonal(travel, np.iinfo(np.int64).max)
+    service = np.fromiter((s.service_minutes for s in sites), dtype=np.int64, count=len(sites))
+    return np.sort(travel.min(axis=0) - service)
+
+
+def _route_minutes_lower_bound(total_service_minutes: int, min_travel_in: np.ndarray, routes: int) -> int:
+    """
+    Lower bound on the route minutes needed to visit every site with `routes` routes.
+    
+    Every site costs its service time, and all but at most one site per route
+    (the first, entered from the depot) is entered from another site, so at
+    least the cheapest len(sites) - routes of those incoming trips are driven.
+    """
+    entered_from_site = max(0, len(min_travel_in) - routes)
+    return total_service_minutes + int(min_travel_in[:entered_from_site].sum())
+
+
+def _max_sites_per_route(sites: List[Site], min_travel_in: np.ndarray, route_minutes: int) -> int:
+    """
+    Upper bound on how many sites a single route can visit.
+    
+    A route with k sites costs at least the k smallest service times plus the
+    k - 1 cheapest incoming trips between sites (the first site is entered
+    from the depot), so k can't exceed the largest count that fits.
+    """
+    service = np.sort(np.fromiter((s.service_minutes for s in sites), dtype=np.int64, count=len(sites)))
+    cost = np.cumsum(service)
+    cost[1:] += np.cumsum(min_travel_in[:len(sites) - 1])
+    return int(np.searchsorted(cost, route_minutes, side="right"))
+
+
 def _validate_calendar_feasibility(
     request: PlanRequest,
     crews: int,
     planning_days: int,
+    site_matrix: np.ndarray,
+    row_of: Dict[str, int],
+    day_routes: Optional[Dict[int, List[List[str]]]] = None,
 ) -> bool:
     """
     Check if a given number of crews can complete all sites within the date range.
     
     Uses fast mode for quick feasibility checks without full optimization.
+    Each day's distance matrix is cut from site_matrix (built once per plan by
+    site_distance_matrix) rather than recomputed for the remaining sites.
+    
+    When day_routes is given, each day's solve is seeded with the routes (site
+    ids) stored for that day by an earlier check, and the routes found are
+    stored back, so checks for neighbouring crew counts start from a solution.
     """
     sites_remaining: List[Site] = list(request.sites)
 
@@ -59,22 +109,14 @@ def _validate_calendar_feasibility(
         "fast_mode": True
     })
 
-    for _ in range(planning_days):
+    for day in range(planning_days):
         if not sites_remaining:
             return True
 
-        # Create virtual depot and prepare sites
-        depot = create_virtual_depot(sites_remaining)
-        sites_with_depot = prepare_sites_with_indices(sites_remaining, depot)
-        
-        # Calculate distance matrix
-        distance_matrix_minutes = calculate_distance_matrix(sites_with_depot)
-        
         # Solve for this day
-        solution = solve_single_day_vrptw(
-            sites=sites_with_depot,
-            request=request_copy,
-            distance_matrix_minutes=distance_matrix_minutes,
+        seed = day_routes.get(day) if day_routes is not None else None
+        solution, sites_with_depot = _solve_remaining_sites(
+            sites_remaining, request_copy, site_matrix, row_of, warm_start_routes=seed
         )
 
         if not solution or solution.get("total_sites_scheduled", 0) == 0:
@@ -82,6 +124,8 @@ def _validate_calendar_feasibility(
 
         # Convert and remove assigned sites
         day_team_days = _convert_solution_to_team_days(solution, sites_with_depot, request_copy.break_minutes)
+        if day_routes is not None:
+            day_routes[day] = [td.site_ids for td in day_team_days]
         _remove_assigned_sites(sites_remaining, day_team_days)
 
     return len(sites_remaining) == 0
@@ -123,24 +167,79 @@ def plan_fixed_calendar(request: PlanRequest) -> CalendarPlanResult:
         service_minutes_per_site=request.service_minutes_per_site,
     )
 
+    # Every feasibility check routes subsets of the same sites
+    site_matrix, row_of = site_distance_matrix(request.sites)
+
+    # Crew counts whose routes can't even hold the service time plus the
+    # cheapest possible travel are rejected without solving
+    total_service_minutes = sum(s.service_minutes for s in request.sites)
+    min_travel_in = _min_travel_into_sites(request.sites, site_matrix)
+
+    # No crew-day can visit more sites than fit in one route, which can put the
+    # search start above the workload estimate when sites are long or far apart
+    sites_per_route = _max_sites_per_route(request.sites, min_travel_in, effective_route_minutes)
+    if sites_per_route > 0 and planning_days > 0:
+        estimated_crews = max(
+            estimated_crews,
+            math.ceil(len(request.sites) / (planning_days * sites_per_route)),
+        )
+
     # In fixed calendar mode, we need to find however many crews it takes
     # to complete all work within the date range. Set a reasonable upper limit.
     MAX_CREW_BUFFER = max(50, estimated_crews * 2)
 
-    for crews in range(estimated_crews, estimated_crews + MAX_CREW_BUFFER):
-        feasible = _validate_calendar_feasibility(
-            request,
-            crews,
-            planning_days,
-        )
+    max_crews = estimated_crews + MAX_CREW_BUFFER - 1
+
+    # Feasibility checks are full multi-day solves; remember each crew count's answer
+    feasible_by_crews: Dict[int, bool] = {}
+
+    # Routes per planning day from the latest check, used to seed the next one
+    day_routes: Dict[int, List[List[str]]] = {}
 
-        if feasible:
+    def is_feasible(crews: int) -> bool:
+        if crews not in feasible_by_crews:
+            routes = crews * planning_days
+            if _route_minutes_lower_bound(total_service_minutes, min_travel_in, routes) > routes * effective_route_minutes:
+                feasible_by_crews[crews] = False
+            else:
+                feasible_by_crews[crews] = _validate_calendar_feasibility(
+                    request,
+                    crews,
+                    planning_days,
+                    site_matrix,
+                    row_of,
+                    day_routes,
+                )
+        return feasible_by_crews[crews]
+
+    # More crews never make the calendar harder to meet, so search for the
+    # fewest feasible crews instead of checking every count in turn: gallop up
+    # from the estimate (usually close to the answer), then bisect
+    lo, hi, step = estimated_crews, estimated_crews, 1
+    min_feasible_crews = max_crews + 1
+    while not is_feasible(hi) and hi < max_crews:
+        lo = hi + 1
+        hi = min(hi + step, max_crews)
+        step *= 2
+    if is_feasible(hi):
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if is_feasible(mid):
+                hi = mid
+            else:
+                lo = mid + 1
+        min_feasible_crews = lo
+
+    # Import here to avoid circular dependency
+    from .crew_planner import plan_fixed_crews
+
+    planned: Dict[int, Optional[CalendarPlanResult]] = {}
+
+    def plan_with(crews: int) -> Optional[CalendarPlanResult]:
+        """Full plan with this crew count, or None if it misses the date range."""
+        if crews not in planned:
             # Update team_config with the calculated number of crews
             updated_team_config = request.team_config.model_copy(update={"teams": crews})
-            
-            # Import here to avoid circular dependency
-            from .crew_planner import plan_fixed_crews
-            
             try:
                 # Try to plan with this crew count
                 result = plan_fixed_crews(
@@ -148,27 +247,42 @@ def plan_fixed_calendar(request: PlanRequest) -> CalendarPlanResult:
                         update={"team_config": updated_team_config}
                     )
                 )
-                
-                # Verify all sites were scheduled within the date range
-                if result.unassigned == 0 and result.end_date <= request.end_date:
-                    return result
-                    
-                # If not all sites scheduled or exceeded date range, try more crews
-                continue
-                
             except RuntimeError as e:
-                # If planning failed with this crew count, try more crews
-                # Only raise if we've exhausted all crew options
-                if crews >= estimated_crews + MAX_CREW_BUFFER - 1:
+                # If planning failed with the most crews allowed, give up
+                if crews >= max_crews:
                     raise RuntimeError(
                         f"Unable to plan within fixed date range even with {crews} crews. "
                         f"Original error: {str(e)}"
                     )
-                continue
+                result = None
+            
+            # Verify all sites were scheduled within the date range
+            if result is not None and (result.unassigned != 0 or result.end_date > request.end_date):
+                result = None
+            planned[crews] = result
+        return planned[crews]
+
+    # A crew count that passes the fast feasibility check can still fail the
+    # full plan; grow the count geometrically until a plan fits, then bisect
+    # back down to the fewest crews that fit
+    if min_feasible_crews <= max_crews:
+        lo, hi, step = min_feasible_crews, min_feasible_crews, 1
+        while plan_with(hi) is None and hi < max_crews:
+            lo = hi + 1
+            hi = min(hi + step, max_crews)
+            step *= 2
+        if plan_with(hi) is not None:
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if plan_with(mid) is not None:
+                    hi = mid
+                else:
+                    lo = mid + 1
+            return plan_with(hi)
 
     raise RuntimeError(
         f"Unable to plan within fixed date range. "
-        f"Tried {estimated_crews} to {estimated_crews + MAX_CREW_BUFFER - 1} crews "
+        f"Tried {estimated_crews} to {max_crews} crews "
         f"for {len(request.sites)} sites over {planning_days} working days. "
         f"Consider: increasing date range, reducing service time, or enabling fast mode."
     )
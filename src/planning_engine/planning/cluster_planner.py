@@ -1,12 +1,25 @@
 """Cluster-based planning: plan each geographic cluster separately."""
 
-from typing import List, Dict
+import logging
+import os
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Optional, Tuple
+import pandas as pd
 from ..models import PlanRequest, PlanResult, Site
+from .._internal.executors import get_spawn_executor, reset_spawn_executor
 from ..core.site_loader import load_sites_from_clustered, create_sites_from_dataframe
 from .calendar_planner import plan_fixed_calendar
 from .crew_planner import plan_fixed_crews
 from .sequential_cluster_planner import plan_clusters_sequentially
 
+logger = logging.getLogger(__name__)
+
+# Upper bound on worker processes used to solve independent clusters
+MAX_CLUSTER_WORKERS = os.cpu_count() or 1
+
+# Name of the worker pool shared across planning runs
+CLUSTER_EXECUTOR = "cluster"
+
 
 def plan_with_clusters(request: PlanRequest) -> PlanResult:
     """
@@ -33,29 +46,29 @@ def plan_with_clusters(request: PlanRequest) -> PlanResult:
         request.service_minutes_per_site
     )
     
-    # Get unique cluster IDs
-    cluster_ids = sorted([int(cid) for cid in df['cluster_id'].unique()])
+    # Split sites by cluster in one pass (sorted by cluster ID)
+    cluster_groups = {int(cid): cluster_df for cid, cluster_df in df.groupby('cluster_id')}
+    cluster_ids = list(cluster_groups)
     num_clusters = len(cluster_ids)
-    print(f"Planning {num_clusters} clusters for state '{request.state_abbr}'...")
+    logger.info("Planning %d clusters for state '%s'", num_clusters, request.state_abbr)
     
     # Determine planning strategy based on mode
     is_calendar_mode = request.start_date is not None and request.end_date is not None
     
     if is_calendar_mode:
         # Calendar mode: Plan each cluster independently with all crews
-        print(f"  Calendar mode: Each cluster can use up to {request.team_config.teams} crews")
-        return _plan_clusters_independently_calendar(request, df, cluster_ids)
+        logger.info("Calendar mode: each cluster can use up to %d crews", request.team_config.teams)
+        return _plan_clusters_independently_calendar(request, cluster_groups)
     else:
         # Fixed crew mode: Use sequential planning where crews work through clusters
-        print(f"  Fixed crew mode: {request.team_config.teams} crews working sequentially through clusters")
+        logger.info("Fixed crew mode: %d crews working sequentially through clusters", request.team_config.teams)
         
         # Prepare cluster data
         cluster_data: Dict[int, List[Site]] = {}
-        for cluster_id in cluster_ids:
-            cluster_df = df[df['cluster_id'] == cluster_id]
+        for cluster_id, cluster_df in cluster_groups.items():
             cluster_sites = create_sites_from_dataframe(cluster_df, request.service_minutes_per_site)
             cluster_data[cluster_id] = cluster_sites
-            print(f"    Cluster {cluster_id}: {len(cluster_sites)} sites")
+            logger.debug("Cluster %d: %d sites", cluster_id, len(cluster_sites))
         
         # Use sequential planning
         calendar_result = plan_clusters_sequentially(request, cluster_data)
@@ -68,26 +81,25 @@ def plan_with_clusters(request: PlanRequest) -> PlanResult:
 
 def _plan_clusters_independently_calendar(
     request: PlanRequest,
-    df,
-    cluster_ids: List[int]
+    cluster_groups: Dict[int, pd.DataFrame]
 ) -> PlanResult:
     """
     Plan clusters independently for calendar mode.
     
     Each cluster is planned separately with the full crew count available,
-    since calendar mode plans for a fixed date range.
+    since calendar mode plans for a fixed date range. Clusters share no sites
+    or crews, so their solves run in parallel worker processes.
     """
     all_team_days = []
     overall_start_date = None
     overall_end_date = None
     
-    # Plan each cluster separately (calendar mode only)
-    for cluster_id in cluster_ids:
-        # Filter sites for this cluster
-        cluster_df = df[df['cluster_id'] == cluster_id]
+    # Build one independent request per cluster (calendar mode only)
+    cluster_requests: Dict[int, PlanRequest] = {}
+    for cluster_id, cluster_df in cluster_groups.items():
         cluster_sites = create_sites_from_dataframe(cluster_df, request.service_minutes_per_site)
         
-        print(f"  Cluster {cluster_id}: {len(cluster_sites)} sites")
+        logger.debug("Cluster %d: %d sites", cluster_id, len(cluster_sites))
 
         # Create a new request for this cluster
         cluster_request = PlanRequest(
@@ -105,10 +117,12 @@ def _plan_clusters_independently_calendar(
             fast_mode=request.fast_mode
         )
         
-        # Plan this cluster with fixed calendar mode
-        print(f"  Planning cluster {cluster_id} with fixed calendar mode...")
-        cluster_calendar_result = plan_fixed_calendar(cluster_request)
-        cluster_result = cluster_calendar_result.to_plan_result()
+        cluster_requests[cluster_id] = cluster_request
+    
+    cluster_results = _plan_clusters_in_parallel(cluster_requests)
+    
+    for cluster_id in cluster_groups:
+        cluster_result = cluster_results[cluster_id]
         
         # Track the overall date range across all clusters
         if cluster_result.start_date:
@@ -122,12 +136,12 @@ def _plan_clusters_independently_calendar(
         for td in cluster_result.team_days:
             td._cluster_id = cluster_id
         all_team_days.extend(cluster_result.team_days)
-        print(f"    ✓ Cluster {cluster_id}: {len(cluster_result.team_days)} team-days scheduled")
+        logger.debug("Cluster %d: %d team-days scheduled", cluster_id, len(cluster_result.team_days))
     
     # Renumber team IDs to avoid duplicates across clusters
     _renumber_team_ids(all_team_days, request.start_date is not None and request.end_date is not None)
     
-    return PlanResult(
+    return PlanResult.model_construct(
         team_days=all_team_days,
         unassigned=0,  # Clusters handle their own unassigned sites
         start_date=overall_start_date,
@@ -135,6 +149,52 @@ def _plan_clusters_independently_calendar(
     )
 
 
+def _plan_cluster_calendar(cluster_request: PlanRequest) -> PlanResult:
+    """Plan a single cluster with fixed calendar mode (runs in a worker process)."""
+    return plan_fixed_calendar(cluster_request).to_plan_result()
+
+
+def _plan_clusters_in_parallel(cluster_requests: Dict[int, PlanRequest]) -> Dict[int, PlanResult]:
+    """
+    Plan independent clusters concurrently, one OR-Tools solve per process.
+    
+    Processes are used rather than threads because each cluster's day-by-day
+    planning loop runs in Python between solves and would serialize on the GIL.
+    Clusters are submitted largest first so the longest job never starts last.
+    
+    Args:
+        cluster_requests: Mapping of cluster_id to that cluster's request
+        
+    Returns:
+        Mapping of cluster_id to its PlanResult
+    """
+    workers = min(len(cluster_requests), MAX_CLUSTER_WORKERS)
+    if workers <= 1:
+        return {
+            cluster_id: _plan_cluster_calendar(cluster_request)
+            for cluster_id, cluster_request in cluster_requests.items()
+        }
+    
+    logger.info("Planning %d clusters with fixed calendar mode across %d processes", len(cluster_requests), workers)
+    executor = get_spawn_executor(CLUSTER_EXECUTOR, MAX_CLUSTER_WORKERS)
+    
+    # Submit the largest clusters first so a big cluster doesn't start last
+    by_size = sorted(cluster_requests.items(), key=lambda item: len(item[1].sites), reverse=True)
+    futures = {}
+    try:
+        for cluster_id, cluster_request in by_size:
+            futures[cluster_id] = executor.submit(_plan_cluster_calendar, cluster_request)
+        return {cluster_id: futures[cluster_id].result() for cluster_id in cluster_requests}
+    except BrokenProcessPool:
+        reset_spawn_executor(CLUSTER_EXECUTOR)
+        raise
+    except BaseException:
+        # Nobody will read the other clusters; don't leave them queued in the shared pool
+        for future in futures.values():
+            future.cancel()
+        raise
+
+
 def _renumber_team_ids(team_days: List, is_calendar_mode: bool) -> None:
     """
     Renumber team IDs to avoid duplicates across clusters.
@@ -145,34 +205,30 @@ def _renumber_team_ids(team_days: List, is_calendar_mode: bool) -> None:
     """
     if is_calendar_mode:
         # Check if we have cluster information
-        has_clusters = any(hasattr(td, '_cluster_id') for td in team_days)
+        has_clusters = any(td._cluster_id is not None for td in team_days)
         
         if has_clusters:
             # Calendar mode with clustering: Renumber per cluster
             # Clusters work in parallel in different geographic areas
             # Within each cluster, the same team can work multiple days
-            from collections import defaultdict
+            # One sort groups team-days by cluster, then orders each cluster by
+            # date and original team_id for consistent numbering
+            ordered = sorted(
+                team_days,
+                key=lambda td: (td._cluster_id if td._cluster_id is not None else 0, td.date or "", td.team_id)
+            )
             
-            cluster_teams = defaultdict(list)
-            for td in team_days:
-                cluster_id = td._cluster_id if hasattr(td, '_cluster_id') else 0
-                cluster_teams[cluster_id].append(td)
-            
-            # Renumber each cluster independently starting from 1
-            for cluster_id, cluster_team_days in cluster_teams.items():
-                # Sort by date and original team_id for consistent ordering
-                cluster_team_days.sort(key=lambda td: (td.date or "", td.team_id))
-                
-                # Map original team IDs to new team IDs within this cluster
-                team_id_map = {}
-                next_team_id = 1
-                
-                for td in cluster_team_days:
-                    original_team_id = td.team_id
-                    if original_team_id not in team_id_map:
-                        team_id_map[original_team_id] = next_team_id
-                        next_team_id += 1
-                    td.team_id = team_id_map[original_team_id]
+            # Map original team IDs to new team IDs, starting from 1 in each cluster
+            current_cluster = None
+            for td in ordered:
+                cluster_id = td._cluster_id if td._cluster_id is not None else 0
+                if cluster_id != current_cluster:
+                    current_cluster = cluster_id
+                    team_id_map = {}
+                original_team_id = td.team_id
+                if original_team_id not in team_id_map:
+                    team_id_map[original_team_id] = len(team_id_map) + 1
+                td.team_id = team_id_map[original_team_id]
         else:
             # Calendar mode without clustering: Each team-day is independent
             for idx, td in enumerate(team_days, start=1):
@@ -180,17 +236,16 @@ def _renumber_team_ids(team_days: List, is_calendar_mode: bool) -> None:
     else:
         # Crew mode: Group by cluster and date, then renumber
         # This ensures the same "team" within a cluster keeps the same ID across days
-        from collections import defaultdict
         
-        # Group by cluster and original team_id to track teams across days
-        cluster_team_map = defaultdict(dict)
+        # Map (cluster, original team_id) to track teams across days
+        cluster_team_map = {}
         next_global_team_id = 1
         
         # Sort by date to ensure consistent ordering
-        team_days.sort(key=lambda td: (td.date or "", td._cluster_id if hasattr(td, '_cluster_id') else 0, td.team_id))
+        team_days.sort(key=lambda td: (td.date or "", td._cluster_id if td._cluster_id is not None else 0, td.team_id))
         
         for td in team_days:
-            cluster_id = td._cluster_id if hasattr(td, '_cluster_id') else 0
+            cluster_id = td._cluster_id if td._cluster_id is not None else 0
             original_team_id = td.team_id
             
             # Create a unique key for this team within its cluster
@@ -203,14 +258,20 @@ def _renumber_team_ids(team_days: List, is_calendar_mode: bool) -> None:
             td.team_id = cluster_team_map[key]
     
     # Convert temporary _cluster_id to permanent cluster_id for UI display
-    # Also generate team_label with 1-based cluster numbering for better UX
+    # Also generate team_label with 1-based cluster numbering for better UX.
+    # Most (cluster, team) pairs repeat across dates, so each label is formatted once
+    label_cache: Dict[Tuple[Optional[int], int], str] = {}
     for td in team_days:
-        if hasattr(td, '_cluster_id'):
+        key = (td._cluster_id, td.team_id)
+        label = label_cache.get(key)
+        if td._cluster_id is not None:
             td.cluster_id = td._cluster_id
-            # Generate team label with 1-based cluster numbering (C1, C2, C3...)
-            # cluster_id is 0-based internally, so add 1 for display
-            td.team_label = f"C{td._cluster_id + 1}-T{td.team_id}"
-            delattr(td, '_cluster_id')
-        else:
+            if label is None:
+                # Generate team label with 1-based cluster numbering (C1, C2, C3...)
+                # cluster_id is 0-based internally, so add 1 for display
+                label = label_cache[key] = f"C{td._cluster_id + 1}-T{td.team_id}"
+            td._cluster_id = None
+        elif label is None:
             # No clustering, just use team ID
-            td.team_label = f"T{td.team_id}"
+            label = label_cache[key] = f"T{td.team_id}"
+        td.team_label = label
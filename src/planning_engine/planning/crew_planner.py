@@ -1,10 +1,11 @@
 """Fixed crew planning: plan with a fixed number of crews over flexible dates."""
 
 from datetime import timedelta, date
-from typing import List
+from typing import AbstractSet, Dict, List, Optional, Tuple
+import numpy as np
 from ..models import PlanRequest, CalendarPlanResult, Site, TeamDay
 from ..core.depot import create_virtual_depot
-from ..solver.solver_utils import prepare_sites_with_indices, calculate_distance_matrix
+from ..solver.solver_utils import prepare_sites_with_indices, site_distance_matrix, depot_distance_matrix
 from ..solver.ortools_solver import solve_single_day_vrptw, _convert_solution_to_team_days
 
 
@@ -24,9 +25,60 @@ def _attach_date(team_days: List[TeamDay], d: date) -> None:
         td.date = d
 
 
-def _is_non_working_day(d: date, holidays: List[date]) -> bool:
-    """Check if a date is a non-working day (weekend or holiday)."""
-    return d.weekday() >= 5 or d in holidays
+def _solve_remaining_sites(
+    sites_remaining: List[Site],
+    request: PlanRequest,
+    site_matrix: np.ndarray,
+    row_of: Dict[str, int],
+    warm_start_routes: Optional[List[List[str]]] = None,
+) -> Tuple[Optional[dict], List[Site]]:
+    """
+    Solve one day's routes over the sites not yet scheduled.
+    
+    A fresh virtual depot is placed at the centroid of the remaining sites; the
+    distance matrix is sliced from site_matrix so only the depot row and column
+    are computed.
+    
+    Args:
+        sites_remaining: Sites still to schedule
+        request: Planning request with constraints
+        site_matrix: Matrix over all sites of the plan, from site_distance_matrix()
+        row_of: Site id to row/column of site_matrix
+        warm_start_routes: Optional site ids per route to seed the search with;
+                           sites no longer remaining are dropped
+        
+    Returns:
+        Tuple of (solution dict or None, sites with depot at index 0)
+    """
+    depot = create_virtual_depot(sites_remaining)
+    sites_with_depot = prepare_sites_with_indices(sites_remaining, depot)
+    distance_matrix_minutes = depot_distance_matrix(site_matrix, row_of, sites_remaining, depot)
+
+    warm_start_nodes = None
+    if warm_start_routes is not None:
+        node_of = {s.id: s.index for s in sites_with_depot[1:]}
+        warm_start_nodes = [
+            [node_of[site_id] for site_id in route if site_id in node_of]
+            for route in warm_start_routes
+        ]
+
+    solution = solve_single_day_vrptw(
+        sites=sites_with_depot,
+        request=request,
+        distance_matrix_minutes=distance_matrix_minutes,
+        warm_start_routes=warm_start_nodes,
+    )
+    return solution, sites_with_depot
+
+
+def _working_days(start: date, holidays: AbstractSet[date], count: int) -> List[date]:
+    """List the first `count` working days on or after start.
+    
+    One numpy business-day call builds the whole table, so planning loops can
+    step straight from one working day to the next.
+    """
+    offsets = np.arange(count)
+    return np.busday_offset(start, offsets, roll="forward", holidays=sorted(holidays)).tolist()
 
 
 def plan_fixed_crews(request: PlanRequest) -> CalendarPlanResult:
@@ -50,7 +102,8 @@ def plan_fixed_crews(request: PlanRequest) -> CalendarPlanResult:
     infeasible_sites: List[Site] = []
     team_days: List[TeamDay] = []
 
-    current_date = request.start_date or date.today()
+    start_date = request.start_date or date.today()
+    end_date = start_date - timedelta(days=1)
     planning_days_used = 0
     consecutive_no_progress_days = 0
     
@@ -58,25 +111,18 @@ def plan_fixed_crews(request: PlanRequest) -> CalendarPlanResult:
     MAX_PLANNING_DAYS = 365
     MAX_CONSECUTIVE_NO_PROGRESS = 5
 
-    while sites_remaining and planning_days_used < MAX_PLANNING_DAYS:
-        # Skip non-working days
-        if _is_non_working_day(current_date, request.holidays):
-            current_date += timedelta(days=1)
-            continue
+    holidays = frozenset(request.holidays)
+
+    # Each day routes a subset of the same sites, so build their matrix once
+    site_matrix, row_of = site_distance_matrix(request.sites)
+
+    # Weekends and holidays are skipped up front
+    for current_date in _working_days(start_date, holidays, MAX_PLANNING_DAYS):
+        if not sites_remaining:
+            break
 
-        # Create virtual depot and prepare sites
-        depot = create_virtual_depot(sites_remaining)
-        sites_with_depot = prepare_sites_with_indices(sites_remaining, depot)
-        
-        # Calculate distance matrix
-        distance_matrix_minutes = calculate_distance_matrix(sites_with_depot)
-        
         # Solve for this day
-        solution = solve_single_day_vrptw(
-            sites=sites_with_depot,
-            request=request,
-            distance_matrix_minutes=distance_matrix_minutes,
-        )
+        solution, sites_with_depot = _solve_remaining_sites(sites_remaining, request, site_matrix, row_of)
 
         sites_scheduled_today = solution.get("total_sites_scheduled", 0) if solution else 0
         
@@ -127,7 +173,7 @@ def plan_fixed_crews(request: PlanRequest) -> CalendarPlanResult:
             _remove_assigned_sites(sites_remaining, day_team_days)
 
         planning_days_used += 1
-        current_date += timedelta(days=1)
+        end_date = current_date
 
     if planning_days_used >= MAX_PLANNING_DAYS:
         raise RuntimeError(
@@ -136,9 +182,9 @@ def plan_fixed_crews(request: PlanRequest) -> CalendarPlanResult:
             f"Consider increasing crew count or adjusting constraints."
         )
 
-    return CalendarPlanResult(
-        start_date=request.start_date or date.today(),
-        end_date=current_date - timedelta(days=1),
+    return CalendarPlanResult.model_construct(
+        start_date=start_date,
+        end_date=end_date,
         team_days=team_days,
         unassigned=len(infeasible_sites),
         crews_used=crews,
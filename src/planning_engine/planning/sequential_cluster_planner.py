@@ -1,12 +1,16 @@
 """Sequential cluster planning: crews work through clusters one after another."""
 
-from datetime import date, timedelta
-from typing import List, Dict, Set
+import heapq
+import logging
+from datetime import date
+from typing import List, Dict, Set, Tuple
+import numpy as np
 from ..models import PlanRequest, CalendarPlanResult, Site, TeamDay, TeamConfig
-from ..core.depot import create_virtual_depot
-from ..solver.solver_utils import prepare_sites_with_indices, calculate_distance_matrix
-from ..solver.ortools_solver import solve_single_day_vrptw, _convert_solution_to_team_days
-from .crew_planner import _is_non_working_day, _remove_assigned_sites
+from ..solver.solver_utils import site_distance_matrix
+from ..solver.ortools_solver import _convert_solution_to_team_days
+from .crew_planner import _remove_assigned_sites, _solve_remaining_sites, _working_days
+
+logger = logging.getLogger(__name__)
 
 
 def plan_clusters_sequentially(
@@ -36,7 +40,7 @@ def plan_clusters_sequentially(
     total_crews = request.team_config.teams
     cluster_ids = sorted(cluster_data.keys())
     
-    print(f"  Sequential planning: {total_crews} crews working through {len(cluster_ids)} clusters")
+    logger.info("Sequential planning: %d crews working through %d clusters", total_crews, len(cluster_ids))
     
     # Track which clusters are complete and which crews are working on which cluster
     completed_clusters: Set[int] = set()
@@ -45,83 +49,88 @@ def plan_clusters_sequentially(
         cid: list(sites) for cid, sites in cluster_data.items()
     }
     
-    # Assign initial clusters to crews (prioritize larger clusters)
-    sorted_clusters = sorted(
-        cluster_data.items(),
-        key=lambda x: len(x[1]),
-        reverse=True
-    )
+    # Clusters no crew has started, largest first (ties by cluster id). Nobody
+    # works an unstarted cluster, so its size never changes while it waits
+    waiting_clusters = [(-len(sites), cid) for cid, sites in cluster_data.items()]
+    heapq.heapify(waiting_clusters)
     
+    # Assign initial clusters to crews (prioritize larger clusters)
     for crew_id in range(1, total_crews + 1):
-        if sorted_clusters:
-            cluster_id, _ = sorted_clusters.pop(0)
+        if waiting_clusters:
+            _, cluster_id = heapq.heappop(waiting_clusters)
             cluster_assignments[crew_id] = cluster_id
-            print(f"    Crew {crew_id} → Cluster {cluster_id} ({len(cluster_data[cluster_id])} sites)")
+            logger.debug("Crew %d → Cluster %d (%d sites)", crew_id, cluster_id, len(cluster_data[cluster_id]))
     
     # Planning loop
     all_team_days: List[TeamDay] = []
-    current_date = request.start_date or date.today()
     planning_days_used = 0
     consecutive_no_progress_days = 0
     
     MAX_PLANNING_DAYS = 365
     MAX_CONSECUTIVE_NO_PROGRESS = 5
     
-    while len(completed_clusters) < len(cluster_ids) and planning_days_used < MAX_PLANNING_DAYS:
-        # Skip non-working days
-        if _is_non_working_day(current_date, request.holidays):
-            current_date += timedelta(days=1)
-            continue
+    holidays = frozenset(request.holidays)
+    
+    # Site-to-site travel matrix per cluster, with each site's row/column
+    cluster_matrices: Dict[int, Tuple[np.ndarray, Dict[str, int]]] = {}
+    
+    # Each crew plans its own cluster with a single-crew request
+    single_crew_request = request.model_copy(update={
+        "team_config": TeamConfig(teams=1, workday=request.team_config.workday)
+    })
+    
+    def solve_crew_day(cluster_id: int, sites_remaining: List[Site]):
+        site_matrix, row_of = cluster_matrices[cluster_id]
+        return _solve_remaining_sites(sites_remaining, single_crew_request, site_matrix, row_of)
+    
+    # Weekends and holidays are skipped up front by the working-day table
+    for current_date in _working_days(request.start_date or date.today(), holidays, MAX_PLANNING_DAYS):
+        if len(completed_clusters) == len(cluster_ids):
+            break
         
         planning_days_used += 1
         day_had_progress = False
         
-        # Plan for each crew working on their assigned cluster
+        # Move crews off finished clusters first; crews work on different
+        # clusters, so this doesn't depend on today's solves
+        active_crews: List[int] = []
         for crew_id in range(1, total_crews + 1):
             if crew_id not in cluster_assignments:
                 continue  # Crew has no assignment (all clusters done)
             
             cluster_id = cluster_assignments[crew_id]
-            sites_remaining = cluster_sites_remaining[cluster_id]
-            
-            if not sites_remaining:
-                # This cluster is complete
-                completed_clusters.add(cluster_id)
-                print(f"    ✓ Cluster {cluster_id} complete (Crew {crew_id})")
-                
-                # Assign this crew to a new cluster if available
-                unassigned_clusters = [
-                    cid for cid in cluster_ids
-                    if cid not in completed_clusters and cid not in cluster_assignments.values()
-                ]
-                
-                if unassigned_clusters:
-                    # Assign to largest remaining cluster
-                    next_cluster = max(unassigned_clusters, key=lambda cid: len(cluster_sites_remaining[cid]))
-                    cluster_assignments[crew_id] = next_cluster
-                    print(f"    Crew {crew_id} → Cluster {next_cluster} ({len(cluster_sites_remaining[next_cluster])} sites)")
-                else:
-                    # No more clusters to assign
-                    del cluster_assignments[crew_id]
-                
+            if cluster_sites_remaining[cluster_id]:
+                active_crews.append(crew_id)
                 continue
             
-            # Plan this crew's work for today on their assigned cluster
-            depot = create_virtual_depot(sites_remaining)
-            sites_with_depot = prepare_sites_with_indices(sites_remaining, depot)
-            distance_matrix_minutes = calculate_distance_matrix(sites_with_depot)
-            
-            # Create a single-crew request for this crew
-            single_crew_request = request.model_copy(update={
-                "team_config": TeamConfig(teams=1, workday=request.team_config.workday)
-            })
-            
-            solution = solve_single_day_vrptw(
-                sites=sites_with_depot,
-                request=single_crew_request,
-                distance_matrix_minutes=distance_matrix_minutes,
-            )
+            # This cluster is complete
+            completed_clusters.add(cluster_id)
+            logger.debug("Cluster %d complete (Crew %d)", cluster_id, crew_id)
             
+            # Assign this crew to a new cluster if available
+            if waiting_clusters:
+                # Assign to largest remaining cluster
+                _, next_cluster = heapq.heappop(waiting_clusters)
+                cluster_assignments[crew_id] = next_cluster
+                logger.debug("Crew %d → Cluster %d (%d sites)", crew_id, next_cluster, len(cluster_sites_remaining[next_cluster]))
+            else:
+                # No more clusters to assign
+                del cluster_assignments[crew_id]
+        
+        # Plan each crew's work for today on their assigned cluster
+        crew_clusters = [cluster_assignments[crew_id] for crew_id in active_crews]
+        crew_sites = [cluster_sites_remaining[cluster_id] for cluster_id in crew_clusters]
+        
+        # A cluster's matrix is built on its first day; later days slice it
+        for cluster_id in crew_clusters:
+            if cluster_id not in cluster_matrices:
+                cluster_matrices[cluster_id] = site_distance_matrix(cluster_data[cluster_id])
+        
+        crew_solutions = [solve_crew_day(cid, sites) for cid, sites in zip(crew_clusters, crew_sites)]
+        
+        for crew_id, cluster_id, sites_remaining, (solution, sites_with_depot) in zip(
+            active_crews, crew_clusters, crew_sites, crew_solutions
+        ):
             if solution and solution.get("total_sites_scheduled", 0) > 0:
                 # Convert solution and assign to this specific crew
                 day_team_days = _convert_solution_to_team_days(
@@ -148,10 +157,8 @@ def plan_clusters_sequentially(
         if not day_had_progress:
             consecutive_no_progress_days += 1
             if consecutive_no_progress_days >= MAX_CONSECUTIVE_NO_PROGRESS:
-                print(f"    ⚠️ No progress for {consecutive_no_progress_days} days, stopping")
+                logger.warning("No progress for %d days, stopping", consecutive_no_progress_days)
                 break
-        
-        current_date += timedelta(days=1)
     
     # Calculate unassigned sites
     total_unassigned = sum(len(sites) for sites in cluster_sites_remaining.values())
@@ -165,13 +172,12 @@ def plan_clusters_sequentially(
         start_date = request.start_date or date.today()
         end_date = start_date
     
-    print(f"  Sequential planning complete:")
-    print(f"    • Clusters completed: {len(completed_clusters)}/{len(cluster_ids)}")
-    print(f"    • Team-days: {len(all_team_days)}")
-    print(f"    • Planning days used: {planning_days_used}")
-    print(f"    • Unassigned sites: {total_unassigned}")
+    logger.info(
+        "Sequential planning complete: %d/%d clusters, %d team-days, %d planning days, %d unassigned sites",
+        len(completed_clusters), len(cluster_ids), len(all_team_days), planning_days_used, total_unassigned,
+    )
     
-    return CalendarPlanResult(
+    return CalendarPlanResult.model_construct(
         start_date=start_date,
         end_date=end_date,
         team_days=all_team_days,
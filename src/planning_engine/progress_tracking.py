@@ -7,14 +7,19 @@ This module provides CRUD operations for progress tracking and
 automatic initialization from geocoded sites.
 """
 
+import os
+import tempfile
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Collection, Dict, List, Optional
 import pandas as pd
 from datetime import date, datetime
 
 from .models import SiteProgress, ProgressResponse
 from .core.workspace import validate_workspace
 
+# Rows formatted per batch when writing progress.csv
+PROGRESS_CSV_CHUNK_ROWS = 10_000
+
 
 def get_progress_csv_path(workspace_name: str) -> Path:
     """Get the path to the progress.csv file for a workspace.
@@ -31,6 +36,26 @@ def get_progress_csv_path(workspace_name: str) -> Path:
     return progress_csv
 
 
+def _write_progress_csv(df: pd.DataFrame, progress_csv: Path) -> None:
+    """Write progress rows to a temporary file, then rename it over progress.csv.
+    
+    Readers (and a crash mid-write) never see a partially written file.
+    
+    Args:
+        df: Progress rows to save
+        progress_csv: Path to progress.csv
+    """
+    # A unique name per write, so concurrent writers never share a temp file
+    fd, tmp_path = tempfile.mkstemp(dir=progress_csv.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            df.to_csv(f, index=False, chunksize=PROGRESS_CSV_CHUNK_ROWS)
+        os.replace(tmp_path, progress_csv)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
 def initialize_progress_from_geocoded(workspace_name: str, force_refresh: bool = False) -> int:
     """Initialize progress.csv from all geocoded sites in the workspace.
     
@@ -48,20 +73,23 @@ def initialize_progress_from_geocoded(workspace_name: str, force_refresh: bool =
     progress_csv = get_progress_csv_path(workspace_name)
     
     # Load existing progress if it exists
-    existing_progress = {}
+    existing_df = pd.DataFrame()
     if progress_csv.exists() and not force_refresh:
         try:
-            df = pd.read_csv(progress_csv)
-            existing_progress = {row['site_id']: row for _, row in df.iterrows()}
+            existing_df = pd.read_csv(progress_csv)
+            # Keep one row per site (the last one, as before)
+            existing_df = existing_df.drop_duplicates(subset='site_id', keep='last')
         except Exception as e:
             print(f"Warning: Could not load existing progress.csv: {e}")
+            existing_df = pd.DataFrame()
+    existing_ids = set(existing_df['site_id'].astype(str)) if 'site_id' in existing_df.columns else set()
     
     # Scan all state directories for geocoded.csv files
     cache_dir = workspace_path / "cache"
     if not cache_dir.exists():
         return 0
     
-    new_sites = []
+    new_frames = []
     current_time = datetime.now().isoformat()
     
     for state_dir in cache_dir.iterdir():
@@ -84,68 +112,121 @@ def initialize_progress_from_geocoded(workspace_name: str, force_refresh: bool =
                 try:
                     df_clustered = pd.read_csv(clustered_csv)
                     # Create mapping of site_id -> cluster_id
-                    for _, row in df_clustered.iterrows():
-                        sid = str(row.get('site_id', row.get('id', '')))
-                        cid = row.get('cluster_id', row.get('cluster', None))
-                        if sid and pd.notna(cid):
-                            cluster_map[sid] = int(cid)
+                    sids = _site_id_column(df_clustered)
+                    cids = _first_column(df_clustered, ['cluster_id', 'cluster'])
+                    if sids is not None and cids is not None:
+                        keep = cids.notna()
+                        cluster_map = dict(zip(sids[keep], cids[keep].astype(int)))
                 except Exception as e:
                     print(f"Warning: Could not load clustered.csv for {state_abbr}: {e}")
             
-            for _, row in df_geocoded.iterrows():
-                site_id = str(row.get('site_id', row.get('id', '')))
-                
-                if not site_id:
-                    continue
-                
-                # Skip if site already exists in progress
-                if site_id in existing_progress:
-                    continue
-                
-                # Extract city from geocoded data
-                city = row.get('city', '')
-                if pd.isna(city):
-                    city = ''
-                
-                # Extract street1 from geocoded data
-                street1 = row.get('street1', '')
-                if pd.isna(street1):
-                    street1 = ''
-                
+            site_ids = _site_id_column(df_geocoded)
+            if site_ids is None:
+                continue
+            
+            # Skip sites that already exist in progress
+            is_new = ~site_ids.isin(existing_ids)
+            if not is_new.any():
+                continue
+            site_ids = site_ids[is_new]
+            
+            # Extract city and street1 from geocoded data
+            new_frames.append(pd.DataFrame({
+                'site_id': site_ids,
+                'status': 'pending',
+                'completed_date': None,
+                'crew_assigned': None,
+                'notes': '',
+                'state': state_abbr,
+                'city': _text_column(df_geocoded, 'city')[is_new],
+                'street1': _text_column(df_geocoded, 'street1')[is_new],
                 # Get cluster_id from cluster_map if available
-                cluster_id = cluster_map.get(site_id, None)
-                
-                # Create new progress entry
-                new_sites.append({
-                    'site_id': site_id,
-                    'status': 'pending',
-                    'completed_date': None,
-                    'crew_assigned': None,
-                    'notes': '',
-                    'state': state_abbr,
-                    'city': city,
-                    'street1': street1,
-                    'cluster_id': cluster_id,
-                    'last_updated': current_time
-                })
+                'cluster_id': site_ids.map(cluster_map),
+                'last_updated': current_time
+            }))
         
         except Exception as e:
             print(f"Warning: Could not process {geocoded_csv}: {e}")
             continue
     
-    if not new_sites and not existing_progress:
+    new_sites_count = sum(len(frame) for frame in new_frames)
+    if new_sites_count == 0 and existing_df.empty:
         # No sites found at all
         return 0
     
-    # Combine existing and new sites
-    all_sites = list(existing_progress.values()) + new_sites
+    # Combine existing and new sites and save to progress.csv
+    frames = [frame for frame in [existing_df] + new_frames if not frame.empty]
+    df = pd.concat(frames, ignore_index=True)
+    _write_progress_csv(df, progress_csv)
     
-    # Save to progress.csv
-    if all_sites:
-        df = pd.DataFrame(all_sites)
-        df.to_csv(progress_csv, index=False)
+    return new_sites_count
+
+
+def _site_id_column(df: pd.DataFrame) -> Optional[pd.Series]:
+    """Site IDs as strings from the site_id (or legacy id) column, or None if neither exists."""
+    column = _first_column(df, ['site_id', 'id'])
+    return column.astype(str) if column is not None else None
+
+
+def _first_column(df: pd.DataFrame, names: List[str]) -> Optional[pd.Series]:
+    """Return the first of the named columns present in df, or None."""
+    for name in names:
+        if name in df.columns:
+            return df[name]
+    return None
+
+
+def _text_column(df: pd.DataFrame, name: str) -> pd.Series:
+    """Return a text column with missing values (or a missing column) as ''."""
+    if name not in df.columns:
+        return pd.Series('', index=df.index, dtype=object)
+    return df[name].astype(object).where(df[name].notna(), '')
+
+
+def _progress_from_dataframe(df: pd.DataFrame) -> List[SiteProgress]:
+    """Convert progress.csv rows to SiteProgress objects.
+    
+    Args:
+        df: Rows read from progress.csv
+        
+    Returns:
+        List of SiteProgress objects in row order
+    """
+    # Normalize whole columns at once, then build SiteProgress objects
+    # from plain records
+    df = df.copy()
+    
+    # Convert site_id to string (pandas may read it as int)
+    if 'site_id' in df.columns:
+        df['site_id'] = df['site_id'].astype(str)
+    
+    # Handle date fields (unparseable dates become None)
+    for date_field in ['scheduled_date']:
+        if date_field in df.columns:
+            parsed = pd.to_datetime(df[date_field], errors='coerce', format='mixed')
+            df[date_field] = parsed.dt.date.astype(object).where(parsed.notna(), None)
+        else:
+            df[date_field] = None
+    
+    # Handle optional string fields; missing columns are for backward
+    # compatibility with old progress.csv files
+    for field in ['crew_assigned', 'notes', 'last_updated', 'city', 'street1']:
+        default = "" if field in ['notes', 'city', 'street1'] else None
+        if field in df.columns:
+            df[field] = df[field].astype(object).where(df[field].notna(), default)
+        else:
+            df[field] = default
+    
+    # Handle cluster_id (convert to int or None)
+    if 'cluster_id' in df.columns:
+        cluster_ids = pd.to_numeric(df['cluster_id'], errors='coerce')
+        df['cluster_id'] = pd.Series(
+            [None if pd.isna(cid) else int(cid) for cid in cluster_ids],
+            index=df.index,
+            dtype=object,
+        )
     
-    return len(new_sites)
+    return [SiteProgress(**record) for record in df.to_dict(orient='records')]
 
 
 def load_progress(workspace_name: str, state_filter: Optional[str] = None) -> ProgressResponse:
@@ -182,44 +263,7 @@ def load_progress(workspace_name: str, state_filter: Optional[str] = None) -> Pr
         if state_filter:
             df = df[df['state'] == state_filter]
         
-        # Convert DataFrame to list of SiteProgress objects
-        progress_list = []
-        for _, row in df.iterrows():
-            progress_data = row.to_dict()
-            
-            # Convert site_id to string (pandas may read it as int)
-            if 'site_id' in progress_data:
-                progress_data['site_id'] = str(progress_data['site_id'])
-            
-            # Handle date fields
-            for date_field in ['scheduled_date']:
-                if date_field in progress_data and pd.notna(progress_data[date_field]):
-                    try:
-                        progress_data[date_field] = pd.to_datetime(progress_data[date_field]).date()
-                    except:
-                        progress_data[date_field] = None
-                else:
-                    progress_data[date_field] = None
-            
-            # Handle optional string fields
-            for field in ['crew_assigned', 'notes', 'last_updated', 'city', 'street1']:
-                if field in progress_data and pd.isna(progress_data[field]):
-                    progress_data[field] = "" if field in ['notes', 'city', 'street1'] else None
-                elif field not in progress_data:
-                    # For backward compatibility with old progress.csv files
-                    progress_data[field] = "" if field in ['notes', 'city', 'street1'] else None
-            
-            # Handle cluster_id (convert to int or None)
-            if 'cluster_id' in progress_data:
-                if pd.isna(progress_data['cluster_id']):
-                    progress_data['cluster_id'] = None
-                else:
-                    try:
-                        progress_data['cluster_id'] = int(progress_data['cluster_id'])
-                    except:
-                        progress_data['cluster_id'] = None
-            
-            progress_list.append(SiteProgress(**progress_data))
+        progress_list = _progress_from_dataframe(df)
         
         # Calculate statistics
         status_counts = df['status'].value_counts().to_dict()
@@ -254,15 +298,72 @@ def save_progress(workspace_name: str, progress_list: List[SiteProgress]) -> Pat
         ])
     else:
         # Convert progress to DataFrame
-        progress_dicts = [p.model_dump() for p in progress_list]
+        progress_dicts = [p.model_dump(mode='json') for p in progress_list]
         df = pd.DataFrame(progress_dicts)
     
     # Save to CSV
-    df.to_csv(progress_csv, index=False)
+    _write_progress_csv(df, progress_csv)
     
     return progress_csv
 
 
+def _load_progress_df(progress_csv: Path) -> pd.DataFrame:
+    """Read progress.csv as a DataFrame for callers that patch and save it.
+    
+    Skips building SiteProgress objects, which load_progress does for API
+    consumers. Site IDs are strings, matching what load_progress reports.
+    
+    Args:
+        progress_csv: Path to progress.csv
+        
+    Returns:
+        Progress rows (an empty frame with a site_id column if the file is
+        missing or has no site_id column)
+    """
+    if progress_csv.exists():
+        df = pd.read_csv(progress_csv)
+        if 'site_id' in df.columns:
+            # pandas may read site IDs as int
+            df['site_id'] = df['site_id'].astype(str)
+            return df
+    return pd.DataFrame({'site_id': pd.Series(dtype=str)})
+
+
+def _patch_progress_rows(workspace_name: str, site_ids: Collection[str], fields: Dict[str, Any]) -> pd.DataFrame:
+    """Set fields on the progress.csv rows for the given sites and save the file.
+    
+    Patches the DataFrame read from progress.csv instead of round-tripping
+    every row through SiteProgress. last_updated is set on every patched row.
+    
+    Args:
+        workspace_name: Name of the workspace
+        site_ids: IDs of the sites to update
+        fields: Column values to set (None values are skipped)
+        
+    Returns:
+        The patched rows (empty if no site matched)
+    """
+    progress_csv = get_progress_csv_path(workspace_name)
+    df = _load_progress_df(progress_csv)
+    
+    mask = df['site_id'].isin(set(site_ids))
+    if not mask.any():
+        return df[mask]
+    
+    updates = {field: value for field, value in fields.items() if value is not None}
+    updates['last_updated'] = datetime.now().isoformat()
+    for field, value in updates.items():
+        if isinstance(value, date):
+            value = value.isoformat()
+        if field not in df.columns:
+            df[field] = None
+        df[field] = df[field].astype(object)
+        df.loc[mask, field] = value
+    
+    _write_progress_csv(df, progress_csv)
+    return df[mask]
+
+
 def update_site_progress(
     workspace_name: str,
     site_id: str,
@@ -287,37 +388,18 @@ def update_site_progress(
     Raises:
         ValueError: If site_id not found
     """
-    response = load_progress(workspace_name)
-    progress_list = response.progress
-    
-    # Find the site
-    site_index = None
-    for i, site in enumerate(progress_list):
-        if site.site_id == site_id:
-            site_index = i
-            break
-    
-    if site_index is None:
+    fields = {
+        'status': status,
+        'scheduled_date': scheduled_date,
+        'crew_assigned': crew_assigned,
+        'notes': notes,
+    }
+    patched = _patch_progress_rows(workspace_name, [site_id], fields)
+    
+    if patched.empty:
         raise ValueError(f"Site '{site_id}' not found in progress tracking")
     
-    # Update fields
-    site = progress_list[site_index]
-    if status is not None:
-        site.status = status
-    if scheduled_date is not None:
-        site.scheduled_date = scheduled_date
-    if crew_assigned is not None:
-        site.crew_assigned = crew_assigned
-    if notes is not None:
-        site.notes = notes
-    
-    # Update timestamp
-    site.last_updated = datetime.now().isoformat()
-    
-    # Save changes
-    save_progress(workspace_name, progress_list)
-    
-    return site
+    return _progress_from_dataframe(patched.head(1))[0]
 
 
 def bulk_update_progress(
@@ -341,31 +423,13 @@ def bulk_update_progress(
     Returns:
         Number of sites updated
     """
-    response = load_progress(workspace_name)
-    progress_list = response.progress
-    
-    current_time = datetime.now().isoformat()
-    updated_count = 0
-    
-    # Update matching sites
-    for site in progress_list:
-        if site.site_id in site_ids:
-            if status is not None:
-                site.status = status
-            if scheduled_date is not None:
-                site.scheduled_date = scheduled_date
-            if crew_assigned is not None:
-                site.crew_assigned = crew_assigned
-            if notes is not None:
-                site.notes = notes
-            
-            site.last_updated = current_time
-            updated_count += 1
-    
-    # Save changes
-    save_progress(workspace_name, progress_list)
-    
-    return updated_count
+    fields = {
+        'status': status,
+        'scheduled_date': scheduled_date,
+        'crew_assigned': crew_assigned,
+        'notes': notes,
+    }
+    return len(_patch_progress_rows(workspace_name, site_ids, fields))
 
 
 def sync_progress_with_plan_result(workspace_name: str, plan_result: dict) -> int:
@@ -383,11 +447,9 @@ def sync_progress_with_plan_result(workspace_name: str, plan_result: dict) -> in
     """
     from datetime import date
     
-    response = load_progress(workspace_name)
-    progress_list = response.progress
-    
     # Build mapping of site_id -> (crew_assigned, scheduled_date) from plan result
-    site_to_info = {}
+    site_to_crew = {}
+    site_to_date = {}
     
     team_days = plan_result.get('team_days', [])
     for team_day in team_days:
@@ -395,37 +457,40 @@ def sync_progress_with_plan_result(workspace_name: str, plan_result: dict) -> in
         site_ids = team_day.get('site_ids', [])
         scheduled_date_str = team_day.get('date')  # ISO format date string
         
-        # Convert date string to date object if available
+        # Normalize the date string if available (invalid dates are dropped)
         scheduled_date = None
         if scheduled_date_str:
             try:
-                scheduled_date = date.fromisoformat(scheduled_date_str)
+                scheduled_date = date.fromisoformat(scheduled_date_str).isoformat()
             except (ValueError, TypeError):
                 scheduled_date = None
         
         for site_id in site_ids:
-            site_to_info[site_id] = {
-                'crew': crew_label,
-                'date': scheduled_date
-            }
+            site_to_crew[site_id] = crew_label
+            site_to_date[site_id] = scheduled_date
     
-    if not site_to_info:
+    if not site_to_crew:
         return 0
     
-    # Update progress with crew assignments and scheduled dates
-    current_time = datetime.now().isoformat()
-    updated_count = 0
+    progress_csv = get_progress_csv_path(workspace_name)
+    df = _load_progress_df(progress_csv)
     
-    for site in progress_list:
-        if site.site_id in site_to_info:
-            info = site_to_info[site.site_id]
-            site.crew_assigned = info['crew']
-            site.scheduled_date = info['date']
-            site.last_updated = current_time
-            updated_count += 1
+    # Update progress with crew assignments and scheduled dates
+    planned = df['site_id'].isin(site_to_crew.keys())
+    updated_count = int(planned.sum())
     
     # Save changes
     if updated_count > 0:
-        save_progress(workspace_name, progress_list)
+        planned_ids = df.loc[planned, 'site_id']
+        for field, values in [
+            ('crew_assigned', planned_ids.map(site_to_crew)),
+            ('scheduled_date', planned_ids.map(site_to_date)),
+            ('last_updated', datetime.now().isoformat()),
+        ]:
+            if field not in df.columns:
+                df[field] = None
+            df[field] = df[field].astype(object)
+            df.loc[planned, field] = values
+        _write_progress_csv(df, progress_csv)
     
     return updated_count
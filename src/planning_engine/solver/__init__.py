@@ -1,11 +1,12 @@
 """OR-Tools solver and utilities."""
 
-from .ortools_solver import solve_vrptw, solve_single_day_vrptw
+from .ortools_solver import solve_vrptw, solve_single_day_vrptw, solve_single_day_vrptw_portfolio
 from .solver_utils import calculate_distance_matrix, prepare_sites_with_indices
 
 __all__ = [
     "solve_vrptw",
     "solve_single_day_vrptw",
+    "solve_single_day_vrptw_portfolio",
     "calculate_distance_matrix",
     "prepare_sites_with_indices",
 ]
@@ -1,14 +1,48 @@
 """OR-Tools VRP solver for route optimization."""
 
+import logging
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
 from datetime import date, datetime, timedelta
 from typing import List, Optional
 from ortools.constraint_solver import routing_enums_pb2
 from ortools.constraint_solver import pywrapcp
+import numpy as np
 
 from ..models import Site, PlanRequest, TeamDay
+from .._internal.executors import get_spawn_executor, reset_spawn_executor
+from .search_tuning import get_tuned_overrides, apply_search_overrides
+from .warm_start import routes_key, get_cached_routes, store_routes
+
+logger = logging.getLogger(__name__)
 
 DEPOT_INDEX = 0  # Virtual depot index (centroid, not physical location)
 
+# Search time limits for fast mode and for the full search
+FAST_MODE_TIME_LIMIT_SECONDS = 1
+TIME_LIMIT_SECONDS = 15
+
+# Stop the full search once the objective hasn't improved for this long
+STALL_SECONDS = 3
+
+# Fast mode returns after this many improving solutions, even within its time limit
+FAST_MODE_SOLUTION_LIMIT = 50
+
+MINUTES_PER_DAY = 24 * 60
+
+# Search strategies raced against each other by solve_single_day_vrptw_portfolio;
+# which one wins varies from instance to instance
+PORTFOLIO_VARIANTS = [
+    {"first_solution_strategy": "PATH_CHEAPEST_ARC", "local_search_metaheuristic": "GUIDED_LOCAL_SEARCH"},
+    {"first_solution_strategy": "PARALLEL_CHEAPEST_INSERTION", "local_search_metaheuristic": "GUIDED_LOCAL_SEARCH"},
+    {"first_solution_strategy": "SAVINGS", "local_search_metaheuristic": "TABU_SEARCH"},
+    {"first_solution_strategy": "CHRISTOFIDES", "local_search_metaheuristic": "SIMULATED_ANNEALING"},
+]
+
+# Name of the worker pool shared across portfolio solves
+PORTFOLIO_EXECUTOR = "portfolio"
+
 
 def _convert_solution_to_team_days(
     solution: dict,
@@ -28,6 +62,10 @@ def _convert_solution_to_team_days(
     """
     team_days = []
 
+    # Visits carry their node index into sites; solutions without one fall
+    # back to matching by name (the first site with a given name wins)
+    sites_by_name = None
+
     for route in solution.get("routes", []):
         crew_id = route["crew_id"]
         visits = route["visits"]
@@ -39,9 +77,19 @@ def _convert_solution_to_team_days(
         total_route = 0
 
         for visit in visits:
-            if visit["site"] == "Virtual Depot (Centroid)":
-                continue  # Skip virtual depot
-            site = next((s for s in sites if s.name == visit["site"]), None)
+            node_index = visit.get("site_index")
+            if node_index is not None:
+                if node_index == DEPOT_INDEX:
+                    continue  # Skip virtual depot
+                site = sites[node_index]
+            else:
+                if visit["site"] == "Virtual Depot (Centroid)":
+                    continue  # Skip virtual depot
+                if sites_by_name is None:
+                    sites_by_name = {}
+                    for s in sites:
+                        sites_by_name.setdefault(s.name, s)
+                site = sites_by_name.get(visit["site"])
             if site:
                 site_ids.append(site.id)
                 route_sites.append(site)
@@ -51,11 +99,11 @@ def _convert_solution_to_team_days(
                 total_route += site.service_minutes + travel_min
 
         if site_ids:
-            td = TeamDay(
+            # Every field is computed here from validated sites, so skip validation
+            td = TeamDay.model_construct(
                 team_id=crew_id + 1,
                 site_ids=site_ids,
                 sites=route_sites,
-                total_minutes=total_service,
                 service_minutes=total_service,
                 travel_minutes=total_travel,
                 route_minutes=total_route,
@@ -78,7 +126,9 @@ def _create_data_model(sites: List[Site], travel_time_matrix: List[List[int]]) -
 def solve_single_day_vrptw(
     sites: List[Site],
     request: PlanRequest,
-    distance_matrix_minutes: List[List[int]]
+    distance_matrix_minutes: List[List[int]],
+    search_overrides: Optional[dict] = None,
+    warm_start_routes: Optional[List[List[int]]] = None
 ) -> Optional[dict]:
     """
     Solve single-day Vehicle Routing Problem with Time Windows using OR-Tools.
@@ -89,6 +139,13 @@ def solve_single_day_vrptw(
         sites: List of sites including virtual depot at index 0
         request: Planning request with constraints
         distance_matrix_minutes: Travel time matrix including service times
+                                 (nested lists or an (N, N) int array)
+        search_overrides: Optional search parameter overrides (see search_tuning).
+                          If None, tuned overrides for this problem size are
+                          used outside fast_mode when available.
+        warm_start_routes: Optional node indices per vehicle (depot excluded) to
+                           start the search from. Ignored if it has more
+                           non-empty routes than vehicles.
         
     Returns:
         Solution dict with routes, or None if no solution found
@@ -99,6 +156,7 @@ def solve_single_day_vrptw(
                 "crew_id": 0,
                 "visits": [{
                     "site": sites[0].name if sites else "",
+                    "site_index": DEPOT_INDEX,
                     "arrival": request.start_date,
                     "service_minutes": sites[0].service_minutes if sites else 0
                 }] if sites else []
@@ -110,22 +168,20 @@ def solve_single_day_vrptw(
 
     data = _create_data_model(sites, distance_matrix_minutes)
 
-    service_time = request.service_minutes_per_site
-    time_per_site = service_time + 15  # Assume 15 min avg travel
-    max_sites_per_vehicle = max(1, int(request.max_route_minutes / time_per_site))
-    estimated_vehicles = max(1, (len(sites) + max_sites_per_vehicle - 1) // max_sites_per_vehicle)
+    num_vehicles = _num_vehicles(len(sites), request)
 
-    # Use team_config.teams for number of vehicles
-    num_vehicles = min(estimated_vehicles, request.get_num_crews())
+    num_locations = data["num_locations"]
+    manager = pywrapcp.RoutingIndexManager(num_locations, num_vehicles, data["depot"])
+    # Every vehicle shares one arc cost evaluator, so the model can collapse
+    # per-vehicle costs; set explicitly rather than rely on the version default
+    model_parameters = pywrapcp.DefaultRoutingModelParameters()
+    model_parameters.reduce_vehicle_cost_model = True
+    routing = pywrapcp.RoutingModel(manager, model_parameters)
 
-    manager = pywrapcp.RoutingIndexManager(data["num_locations"], num_vehicles, data["depot"])
-    routing = pywrapcp.RoutingModel(manager)
+    # Transit matrix is stored C++-side, so search never calls back into Python
+    matrix = np.asarray(data["distance_matrix"], dtype=np.int64).reshape(num_locations, num_locations)
+    transit_callback_index = routing.RegisterTransitMatrix(matrix.tolist())
 
-    # Distance callback
-    def distance_callback(from_index, to_index):
-        return data["distance_matrix"][manager.IndexToNode(from_index)][manager.IndexToNode(to_index)]
-
-    transit_callback_index = routing.RegisterTransitCallback(distance_callback)
     routing.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
 
     # Add time dimension
@@ -150,29 +206,50 @@ def solve_single_day_vrptw(
 
     # Add disjunctions to allow skipping sites if needed
     PENALTY = 10_000
+    node_to_index = manager.NodeToIndex
+    add_disjunction = routing.AddDisjunction
     for site in sites:
-        if site.index == DEPOT_INDEX:
-            continue
-        index = manager.NodeToIndex(site.index)
-        routing.AddDisjunction([index], PENALTY)
+        if site.index != DEPOT_INDEX:
+            add_disjunction([node_to_index(site.index)], PENALTY)
 
     # Search parameters
     search_parameters = pywrapcp.DefaultRoutingSearchParameters()
      
     # Adjust time limit based on fast_mode
     if request.fast_mode:
-        search_parameters.time_limit.seconds = 1
+        search_parameters.time_limit.seconds = FAST_MODE_TIME_LIMIT_SECONDS
         search_parameters.first_solution_strategy = routing_enums_pb2.FirstSolutionStrategy.PATH_CHEAPEST_ARC
         search_parameters.local_search_metaheuristic = routing_enums_pb2.LocalSearchMetaheuristic.AUTOMATIC
         search_parameters.lns_time_limit.seconds = 0
+        search_parameters.solution_limit = FAST_MODE_SOLUTION_LIMIT
     else:
-        search_parameters.time_limit.seconds = 15
+        search_parameters.time_limit.seconds = TIME_LIMIT_SECONDS
         search_parameters.first_solution_strategy = routing_enums_pb2.FirstSolutionStrategy.PARALLEL_CHEAPEST_INSERTION
         search_parameters.local_search_metaheuristic = routing_enums_pb2.LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH
+        if search_overrides is None:
+            search_overrides = get_tuned_overrides(len(sites) - 1, num_vehicles)
+        # Guided local search never terminates on its own; return once it stalls
+        _stop_search_when_stalled(routing, STALL_SECONDS)
+    
+    if search_overrides:
+        apply_search_overrides(search_parameters, search_overrides)
     
     search_parameters.log_search = False
 
-    solution = routing.SolveWithParameters(search_parameters)
+    # Warm-start from the given routes if they still fit
+    initial_solution = None
+    if warm_start_routes is not None:
+        warm_start_routes = [route for route in warm_start_routes if route]
+        if len(warm_start_routes) > num_vehicles:
+            warm_start_routes = None
+    if warm_start_routes is not None:
+        routing.CloseModelWithParameters(search_parameters)
+        initial_solution = routing.ReadAssignmentFromRoutes(warm_start_routes, True)
+
+    if initial_solution is not None:
+        solution = routing.SolveFromAssignmentWithParameters(initial_solution, search_parameters)
+    else:
+        solution = routing.SolveWithParameters(search_parameters)
     if not solution:
         return {
             "routes": [],
@@ -182,53 +259,223 @@ def solve_single_day_vrptw(
         }
 
     # Extract solution
-    return _extract_solution(routing, manager, solution, sites, request.start_date, time_dimension)
+    return _extract_solution(routing, manager, solution, sites, request.start_date, time_dimension, matrix)
 
 
-def _extract_solution(routing, manager, solution, sites, start_date, time_dimension):
+def _num_vehicles(num_locations: int, request: PlanRequest) -> int:
+    """Estimate the vehicles a day needs, capped at the crews available."""
+    service_time = request.service_minutes_per_site
+    time_per_site = service_time + 15  # Assume 15 min avg travel
+    max_sites_per_vehicle = max(1, int(request.max_route_minutes / time_per_site))
+    estimated_vehicles = max(1, (num_locations + max_sites_per_vehicle - 1) // max_sites_per_vehicle)
+
+    # Use team_config.teams for number of vehicles
+    return min(estimated_vehicles, request.get_num_crews())
+
+
+def _search_settings(num_locations: int, request: PlanRequest) -> dict:
+    """
+    Collect the search configuration a single-day solve of this size would use.
+    
+    Cached plans are keyed on it, so re-tuning, editing PORTFOLIO_VARIANTS or
+    changing a time limit doesn't keep serving plans from the old search.
+    
+    Args:
+        num_locations: Number of sites including the virtual depot
+        request: Planning request with constraints
+        
+    Returns:
+        JSON-serializable dict of the effective search settings
+    """
+    if request.fast_mode:
+        return {
+            "time_limit": FAST_MODE_TIME_LIMIT_SECONDS,
+            "solution_limit": FAST_MODE_SOLUTION_LIMIT,
+        }
+    settings = {"time_limit": TIME_LIMIT_SECONDS, "stall_seconds": STALL_SECONDS}
+    if min(len(PORTFOLIO_VARIANTS), os.cpu_count() or 1) >= 2:
+        settings["variants"] = PORTFOLIO_VARIANTS
+    else:
+        settings["variants"] = [get_tuned_overrides(num_locations - 1, _num_vehicles(num_locations, request))]
+    return settings
+
+
+def solve_single_day_vrptw_portfolio(
+    sites: List[Site],
+    request: PlanRequest,
+    distance_matrix_minutes: List[List[int]],
+    warm_start_routes: Optional[List[List[int]]] = None
+) -> Optional[dict]:
+    """
+    Solve with several search strategies in parallel processes and keep the best.
+    
+    Each entry of PORTFOLIO_VARIANTS runs as its own solve_single_day_vrptw call.
+    All variants are awaited, so none keeps a worker busy after this returns.
+    Solutions are ranked by unassigned sites, then total travel minutes, with
+    ties going to the variant listed first, so the pick never depends on which
+    variant finished first. Fast mode, machines without a spare CPU, and a
+    portfolio whose workers all fail use a single in-process solve instead.
+    
+    Args:
+        sites: List of sites including virtual depot at index 0
+        request: Planning request with constraints
+        distance_matrix_minutes: Travel time matrix including service times
+        warm_start_routes: Optional node indices per vehicle (depot excluded) that
+                           every variant starts its search from
+        
+    Returns:
+        Best solution dict with routes, or None if no solution found
+    """
+    workers = min(len(PORTFOLIO_VARIANTS), os.cpu_count() or 1)
+    if request.fast_mode or workers < 2 or len(sites) < 2:
+        return solve_single_day_vrptw(
+            sites, request, distance_matrix_minutes, warm_start_routes=warm_start_routes
+        )
+
+    best = None
+    best_score = None
+    executor = get_spawn_executor(PORTFOLIO_EXECUTOR, workers)
+    futures = [
+        executor.submit(
+            solve_single_day_vrptw, sites, request, distance_matrix_minutes, overrides, warm_start_routes
+        )
+        for overrides in PORTFOLIO_VARIANTS
+    ]
+    try:
+        # Wait for every variant so the pick doesn't depend on finishing order
+        for variant, future in enumerate(futures):
+            try:
+                solution = future.result()
+            except BrokenProcessPool:
+                reset_spawn_executor(PORTFOLIO_EXECUTOR)
+                logger.warning("Portfolio worker pool broke after %d variants", variant)
+                break
+            except Exception as e:
+                logger.warning("Portfolio variant %d failed: %s", variant, e)
+                continue
+            if solution is None:
+                continue
+            score = (*_solution_score(solution), variant)
+            if best_score is None or score < best_score:
+                best, best_score = solution, score
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        raise
+
+    if best is None:
+        return solve_single_day_vrptw(
+            sites, request, distance_matrix_minutes, warm_start_routes=warm_start_routes
+        )
+    return best
+
+
+def _solution_score(solution: dict) -> tuple:
+    """Rank solutions by unassigned sites first, then total travel minutes."""
+    travel = sum(visit.get("travel_minutes", 0) for route in solution["routes"] for visit in route["visits"])
+    return solution["unassigned"], travel
+
+
+def _routes_from_solution(solution: dict) -> List[List[int]]:
+    """Get the visited node indices per route of a solution, excluding the depot."""
+    return [
+        [visit["site_index"] for visit in route["visits"] if visit["site_index"] != DEPOT_INDEX]
+        for route in solution["routes"]
+    ]
+
+
+def _stop_search_when_stalled(routing, stall_seconds: float) -> None:
+    """
+    Finish the search early when the best objective stops improving.
+    
+    The callback runs on every solution the search accepts, so the search
+    ends at the first solution found after stall_seconds without improvement.
+    The time limit still bounds the search if no further solutions arrive.
+    
+    Args:
+        routing: OR-Tools routing model, before SolveWithParameters
+        stall_seconds: Seconds without improvement before stopping
+    """
+    best = {"cost": None, "time": time.monotonic()}
+
+    def on_solution():
+        cost = routing.CostVar().Value()
+        now = time.monotonic()
+        if best["cost"] is None or cost < best["cost"]:
+            best["cost"] = cost
+            best["time"] = now
+        elif now - best["time"] >= stall_seconds:
+            routing.solver().FinishCurrentSearch()
+
+    routing.AddAtSolutionCallback(on_solution)
+
+
+def _extract_solution(routing, manager, solution, sites, start_date, time_dimension, matrix):
     """
     Extract solution from OR-Tools routing model.
     
     Note: The distance matrix includes service time at destination, so we need to
     subtract service time to get pure travel time for reporting purposes.
+    
+    Each route is first walked once to collect its node indices and arrival
+    times; travel minutes for the whole route are then read from the (N, N)
+    matrix the solver used in one NumPy lookup, and arrival dates are derived
+    once per day offset instead of once per visit.
     """
     routes = []
     total_sites = 0
     used_vehicles = 0
+    arrival_dates = {}
+    service = np.fromiter((s.service_minutes for s in sites), dtype=np.int64, count=len(sites))
+
+    # Bind the SWIG methods called per visit once
+    value = solution.Value
+    index_to_node = manager.IndexToNode
+    is_end = routing.IsEnd
+    next_var = routing.NextVar
+    cumul_var = time_dimension.CumulVar
 
     for vehicle_id in range(routing.vehicles()):
         index = routing.Start(vehicle_id)
+        nodes = []
+        arrivals = []
+        while not is_end(index):
+            nodes.append(index_to_node(index))
+            arrivals.append(value(cumul_var(index)))
+            index = value(next_var(index))
+
+        if not nodes:
+            continue
+
+        # Arc cost to the next node includes service there; subtract it to get
+        # pure travel time. The last visit has no next node, so travels 0.
+        path = np.array(nodes, dtype=np.intp)
+        travel = np.zeros(len(nodes), dtype=np.int64)
+        travel[:-1] = matrix[path[:-1], path[1:]] - service[path[1:]]
+
         route = []
-        while not routing.IsEnd(index):
-            node_index = manager.IndexToNode(index)
+        append = route.append
+        for node_index, arrival, travel_min in zip(nodes, arrivals, travel.tolist()):
             site = sites[node_index]
-            time_var = time_dimension.CumulVar(index)
-            arrival = solution.Value(time_var)
-            arrival_date = start_date + timedelta(minutes=arrival) if start_date else arrival
-            
-            # Get arc cost to next node (includes travel + service at next node)
-            next_index = solution.Value(routing.NextVar(index))
-            if not routing.IsEnd(next_index):
-                arc_cost = routing.GetArcCostForVehicle(index, next_index, vehicle_id)
-                next_node = manager.IndexToNode(next_index)
-                next_site = sites[next_node]
-                # Subtract service time at next site to get pure travel time
-                travel_min = arc_cost - next_site.service_minutes
+            if start_date:
+                # date + timedelta(minutes=...) only advances whole days
+                day_offset = arrival // MINUTES_PER_DAY
+                arrival_date = arrival_dates.get(day_offset)
+                if arrival_date is None:
+                    arrival_date = arrival_dates[day_offset] = start_date + timedelta(days=day_offset)
             else:
-                travel_min = 0
+                arrival_date = arrival
 
-            route.append({
+            append({
                 "site": site.name,
+                "site_index": node_index,
                 "arrival": arrival_date,
                 "service_minutes": site.service_minutes,
                 "travel_minutes": travel_min
             })
-            total_sites += 1
-            index = next_index
-
-        if route:
-            used_vehicles += 1
-            routes.append({"crew_id": vehicle_id, "visits": route})
+        total_sites += len(route)
+        used_vehicles += 1
+        routes.append({"crew_id": vehicle_id, "visits": route})
 
     # Calculate unassigned sites (excluding depot from count)
     unassigned = (len(sites) - 1) - (total_sites - used_vehicles)
@@ -254,7 +501,8 @@ def solve_vrptw(request: PlanRequest) -> dict:
         Solution dict with routes
     """
     from ..core.depot import create_virtual_depot
-    from .solver_utils import prepare_sites_with_indices, calculate_distance_matrix
+    from .solver_utils import prepare_sites_with_indices, workspace_matrix_cache_dir
+    from .travel_matrix_cache import get_or_build_matrix_array
     
     if not request.sites:
         return {
@@ -268,8 +516,10 @@ def solve_vrptw(request: PlanRequest) -> dict:
     depot = create_virtual_depot(request.sites)
     sites_with_depot = prepare_sites_with_indices(request.sites, depot)
     
-    # Calculate distance matrix
-    distance_matrix = calculate_distance_matrix(sites_with_depot)
+    # Calculate distance matrix (the cached array itself, not a nested-list copy)
+    distance_matrix = get_or_build_matrix_array(
+        sites_with_depot, cache_dir=workspace_matrix_cache_dir(request.workspace)
+    )
     
     # Solve
     return solve_single_day_vrptw(sites_with_depot, request, distance_matrix)
@@ -289,24 +539,48 @@ def plan_single_day_vrp(request: PlanRequest):
     """
     from ..models import PlanResult
     from ..core.depot import create_virtual_depot
-    from .solver_utils import prepare_sites_with_indices, calculate_distance_matrix
+    from .solver_utils import prepare_sites_with_indices, workspace_matrix_cache_dir
+    from .travel_matrix_cache import get_or_build_matrix_array
+    from .solution_cache import solution_key, get_cached_solution, store_solution
     
     if not request.sites:
-        return PlanResult(team_days=[], unassigned=0)
+        return PlanResult.model_construct(team_days=[], unassigned=0)
+    
+    # Identical problems reuse the plan solved last time
+    cache_dir = workspace_matrix_cache_dir(request.workspace)
+    solution_dir = cache_dir / "vrp" if cache_dir is not None else None
+    if solution_dir is not None:
+        key = solution_key(request.sites, request, _search_settings(len(request.sites) + 1, request))
+        cached = get_cached_solution(solution_dir, key)
+        if cached is not None:
+            return cached
     
     # Create virtual depot and prepare sites
     depot = create_virtual_depot(request.sites)
     sites_with_depot = prepare_sites_with_indices(request.sites, depot)
     
-    # Calculate distance matrix
-    distance_matrix = calculate_distance_matrix(sites_with_depot)
+    # Calculate distance matrix (the cached array itself, not a nested-list copy)
+    distance_matrix = get_or_build_matrix_array(sites_with_depot, cache_dir=cache_dir)
+    
+    # Re-planning the same sites and limits starts from the routes solved last time
+    warm_start_key = routes_key(
+        sites_with_depot, request.get_num_crews(), request.max_route_minutes, request.break_minutes
+    )
     
     # Solve
-    solution = solve_single_day_vrptw(sites_with_depot, request, distance_matrix)
+    solution = solve_single_day_vrptw_portfolio(
+        sites_with_depot, request, distance_matrix, warm_start_routes=get_cached_routes(warm_start_key)
+    )
     
     if not solution:
-        return PlanResult(team_days=[], unassigned=len(request.sites))
+        return PlanResult.model_construct(team_days=[], unassigned=len(request.sites))
+    
+    store_routes(warm_start_key, _routes_from_solution(solution))
     
     team_days = _convert_solution_to_team_days(solution, sites_with_depot, request.break_minutes)
+    result = PlanResult.model_construct(team_days=team_days, unassigned=solution.get("unassigned", 0))
+    
+    if solution_dir is not None:
+        store_solution(solution_dir, key, result)
     
-    return PlanResult(team_days=team_days, unassigned=solution.get("unassigned", 0))
+    return result
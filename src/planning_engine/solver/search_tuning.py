@@ -0,0 +1,98 @@
+"""Per-workload overrides for OR-Tools routing search parameters.
+
+Overrides are produced offline by src/scripts/tune_search_params.py and stored
+in tuned_params.json next to this module, keyed by site-count and crew-count
+bucket. When no file or no matching bucket exists the solver keeps its
+built-in defaults.
+"""
+
+import functools
+import json
+from pathlib import Path
+from typing import Dict, Optional
+
+from ortools.constraint_solver import routing_enums_pb2
+
+TUNED_PARAMS_FILE = Path(__file__).parent / "tuned_params.json"
+
+# Upper bounds (inclusive) of the site-count and crew-count buckets
+SITE_BUCKETS = (25, 50, 100, 200, 400)
+CREW_BUCKETS = (1, 2, 4, 8)
+
+# Search parameter fields that take enum names in tuned_params.json
+_ENUM_FIELDS = {
+    "first_solution_strategy": routing_enums_pb2.FirstSolutionStrategy,
+    "local_search_metaheuristic": routing_enums_pb2.LocalSearchMetaheuristic,
+}
+
+# Plain numeric search parameter fields that may be overridden
+_NUMERIC_FIELDS = ("guided_local_search_lambda_coefficient",)
+
+
+def _bucket(value: int, bounds: tuple) -> str:
+    """Return the label of the first bucket whose upper bound covers value."""
+    for bound in bounds:
+        if value <= bound:
+            return f"<={bound}"
+    return f">{bounds[-1]}"
+
+
+def bucket_key(num_sites: int, num_crews: int) -> str:
+    """
+    Build the tuned_params.json key for a problem size.
+
+    Args:
+        num_sites: Number of sites to route (excluding depot)
+        num_crews: Number of vehicles available
+
+    Returns:
+        Key such as "sites<=100|crews<=2"
+    """
+    return f"sites{_bucket(num_sites, SITE_BUCKETS)}|crews{_bucket(num_crews, CREW_BUCKETS)}"
+
+
+@functools.lru_cache(maxsize=1)
+def _load_tuned_params() -> Dict[str, dict]:
+    """Load tuned overrides once per process; missing file means no overrides."""
+    if not TUNED_PARAMS_FILE.exists():
+        return {}
+    with open(TUNED_PARAMS_FILE) as f:
+        return json.load(f)
+
+
+def get_tuned_overrides(num_sites: int, num_crews: int) -> Optional[dict]:
+    """
+    Look up tuned search parameter overrides for a problem size.
+
+    Args:
+        num_sites: Number of sites to route (excluding depot)
+        num_crews: Number of vehicles available
+
+    Returns:
+        Dict of search parameter overrides, or None if none were tuned
+    """
+    return _load_tuned_params().get(bucket_key(num_sites, num_crews))
+
+
+def apply_search_overrides(search_parameters, overrides: dict) -> None:
+    """
+    Apply overrides to an OR-Tools RoutingSearchParameters message in place.
+
+    Args:
+        search_parameters: Parameters from pywrapcp.DefaultRoutingSearchParameters()
+        overrides: Mapping of field name to value; enum fields use their names
+                   (e.g. {"first_solution_strategy": "SAVINGS"}) and
+                   "time_limit_seconds" sets time_limit.seconds
+
+    Raises:
+        ValueError: If an override names an unsupported field
+    """
+    for field, value in overrides.items():
+        if field in _ENUM_FIELDS:
+            setattr(search_parameters, field, _ENUM_FIELDS[field].Value.Value(value))
+        elif field == "time_limit_seconds":
+            search_parameters.time_limit.seconds = int(value)
+        elif field in _NUMERIC_FIELDS:
+            setattr(search_parameters, field, value)
+        else:
+            raise ValueError(f"Unsupported search parameter override: '{field}'")
@@ -0,0 +1,103 @@
+"""Persistent cache of single-day plans keyed by their solver inputs.
+
+Interactive planning often re-runs plan_single_day_vrp with inputs that don't
+change the routing problem. Plans are stored as JSON under the workspace's
+cache/vrp/ directory, keyed by a SHA-256 of everything the solver reads,
+including its search configuration, so identical problems skip the OR-Tools
+solve.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+
+from ..models import PlanRequest, PlanResult, Site
+
+logger = logging.getLogger(__name__)
+
+# Cached plans kept per workspace; least recently used files are evicted
+MAX_CACHED_SOLUTIONS = 500
+
+
+def solution_key(sites: List[Site], request: PlanRequest, search_settings: dict) -> str:
+    """
+    Hash the sites, request settings and search setup that determine a plan.
+
+    Args:
+        sites: Sites to route (excluding depot)
+        request: Planning request with constraints
+        search_settings: JSON-serializable search configuration the solve uses
+                         (strategies, tuned overrides, time limits)
+
+    Returns:
+        SHA-256 hex digest identifying the plan
+    """
+    canonical_inputs = {
+        "sites": sorted(
+            [s.id, s.name, s.lat, s.lon, s.service_minutes] for s in sites
+        ),
+        "num_crews": request.get_num_crews(),
+        "max_route_minutes": request.max_route_minutes,
+        "break_minutes": request.break_minutes,
+        "service_minutes_per_site": request.service_minutes_per_site,
+        "start_date": request.start_date.isoformat() if request.start_date else None,
+        "fast_mode": request.fast_mode,
+        "search": search_settings,
+    }
+    return hashlib.sha256(json.dumps(canonical_inputs, sort_keys=True).encode()).hexdigest()
+
+
+def get_cached_solution(cache_dir: Path, key: str) -> Optional[PlanResult]:
+    """
+    Load a cached plan, marking it as recently used.
+
+    Args:
+        cache_dir: Directory holding cached plans
+        key: Plan key from solution_key()
+
+    Returns:
+        The cached PlanResult, or None on a miss or unreadable entry
+    """
+    path = Path(cache_dir) / f"{key}.json"
+    try:
+        result = PlanResult.model_validate_json(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except ValueError as e:
+        logger.warning("Ignoring unreadable cached plan %s: %s", path, e)
+        return None
+    os.utime(path)
+    return result
+
+
+def store_solution(cache_dir: Path, key: str, result: PlanResult) -> None:
+    """
+    Save a plan and evict the least recently used plans beyond the limit.
+
+    Args:
+        cache_dir: Directory holding cached plans
+        key: Plan key from solution_key()
+        result: Plan to cache
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_dir / f"{key}.json"
+    # Write then rename so concurrent readers never see a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(result.model_dump_json(warnings=False))
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+    entries = list(cache_dir.glob("*.json"))
+    if len(entries) > MAX_CACHED_SOLUTIONS:
+        entries.sort(key=lambda p: p.stat().st_mtime)
+        for stale in entries[:len(entries) - MAX_CACHED_SOLUTIONS]:
+            stale.unlink(missing_ok=True)
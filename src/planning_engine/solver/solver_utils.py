@@ -1,28 +1,119 @@
 """Utilities for solver operations: distance matrix, site preparation."""
 
-from typing import List
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 from ..models import Site
-from .._internal.utils import calculate_distance_matrix as _calc_distance_matrix
+from .._internal.utils import site_arrays, travel_minutes_between
+from .travel_matrix_cache import get_or_build_matrix, get_or_build_matrix_array
 
 
-def calculate_distance_matrix(sites: List[Site], avg_speed_kmh: float = 60.0) -> List[List[int]]:
+def calculate_distance_matrix(
+    sites: List[Site],
+    avg_speed_kmh: float = 60.0,
+    cache_dir: Optional[Path] = None
+) -> List[List[int]]:
     """
     Calculate distance matrix between all sites in minutes.
     
+    Matrices are cached by site-set fingerprint, so re-planning the same
+    sites reuses the previous matrix.
+    
     Args:
         sites: List of sites including depot (if applicable)
         avg_speed_kmh: Average travel speed in km/h
+        cache_dir: Optional directory to persist matrices across processes
         
     Returns:
         Distance matrix in minutes (2D list)
     """
-    return _calc_distance_matrix(sites, avg_speed_kmh)
+    return get_or_build_matrix(sites, avg_speed_kmh, cache_dir)
+
+
+def site_distance_matrix(
+    sites: List[Site],
+    avg_speed_kmh: float = 60.0
+) -> Tuple[np.ndarray, Dict[str, int]]:
+    """
+    Build the matrix over all sites once, for slicing with depot_distance_matrix().
+    
+    Args:
+        sites: All sites a multi-day plan may route (excluding depot)
+        avg_speed_kmh: Average travel speed in km/h
+        
+    Returns:
+        Tuple of (read-only site matrix, site id to row/column index)
+    """
+    row_of = {site.id: row for row, site in enumerate(sites)}
+    return get_or_build_matrix_array(sites, avg_speed_kmh), row_of
+
+
+def depot_distance_matrix(
+    site_matrix: np.ndarray,
+    row_of: Dict[str, int],
+    sites: List[Site],
+    depot: Site,
+    avg_speed_kmh: float = 60.0
+) -> np.ndarray:
+    """
+    Distance matrix for depot + sites, cut from a matrix built once for all sites.
+    
+    Multi-day planners solve shrinking subsets of the same sites with a new
+    centroid depot each day. Site-to-site entries are taken from site_matrix;
+    only the depot row and column are computed, so each day costs O(N) haversine
+    evaluations instead of O(N²). The result equals
+    calculate_distance_matrix(prepare_sites_with_indices(sites, depot)).
+    
+    Args:
+        site_matrix: Matrix over all sites, from get_or_build_matrix_array()
+        row_of: Site id to row/column of site_matrix
+        sites: Subset of sites to route (excluding depot)
+        depot: Virtual depot site (centroid)
+        avg_speed_kmh: Average travel speed in km/h
+        
+    Returns:
+        (N+1, N+1) distance matrix in minutes with the depot at index 0
+    """
+    n = len(sites)
+    rows = np.fromiter((row_of[s.id] for s in sites), dtype=np.intp, count=n)
+    lat, lon, service = site_arrays(sites)
+
+    matrix = np.zeros((n + 1, n + 1), dtype=np.int32)
+    matrix[1:, 1:] = site_matrix[np.ix_(rows, rows)]
+    if n:
+        depot_lat, depot_lon = np.array([depot.lat]), np.array([depot.lon])
+        from_depot = travel_minutes_between(depot_lat, depot_lon, lat, lon, avg_speed_kmh)[0]
+        to_depot = travel_minutes_between(lat, lon, depot_lat, depot_lon, avg_speed_kmh)[:, 0]
+        matrix[0, 1:] = from_depot + service
+        matrix[1:, 0] = to_depot + depot.service_minutes
+    return matrix
+
+
+def workspace_matrix_cache_dir(workspace_name: Optional[str]) -> Optional[Path]:
+    """
+    Get the directory for persisted travel-time matrices of a workspace.
+    
+    Args:
+        workspace_name: Name of the workspace
+        
+    Returns:
+        The workspace's cache directory, or None if the workspace doesn't exist
+    """
+    from ..core.workspace import get_workspace_path
+    
+    if not workspace_name:
+        return None
+    workspace_path = get_workspace_path(workspace_name)
+    return workspace_path / "cache" if workspace_path.exists() else None
 
 
 def prepare_sites_with_indices(sites: List[Site], depot: Site) -> List[Site]:
     """
     Prepare sites list with depot at index 0 and assign indices to all sites.
     
+    Sites are frozen, so indexed copies are returned and the input sites are
+    left untouched.
+    
     Args:
         sites: List of sites to prepare
         depot: Virtual depot site (centroid)
@@ -30,7 +121,7 @@ def prepare_sites_with_indices(sites: List[Site], depot: Site) -> List[Site]:
     Returns:
         List with depot at index 0, followed by sites, all with indices assigned
     """
-    sites_with_depot = [depot] + sites
-    for idx, site in enumerate(sites_with_depot):
-        site.index = idx
-    return sites_with_depot
+    return [
+        site if site.index == idx else site.model_copy(update={"index": idx})
+        for idx, site in enumerate([depot] + sites)
+    ]
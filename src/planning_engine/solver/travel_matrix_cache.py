@@ -0,0 +1,182 @@
+"""Two-tier cache for travel-time matrices keyed by a site-set fingerprint.
+
+Re-planning a workspace with different solver settings (route length, break
+time, fast mode) reuses the same site coordinates, so the N×N travel-time
+matrix only needs to be built once. Matrices are kept as compact int16 arrays
+(int32 if a value exceeds the int16 range) in a small in-process LRU and, when
+a cache directory is given, as .npy files that other processes (e.g. API
+workers) can memory-map.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from ..models import Site
+from .._internal.utils import site_arrays, travel_time_array_from_arrays
+
+logger = logging.getLogger(__name__)
+
+# Matrix files kept per cache directory; least recently used files are evicted
+MAX_CACHED_MATRICES = 100
+
+# Matrices kept in memory per process
+_MEMORY_CACHE_SIZE = 32
+
+# Largest value stored as int16; travel minutes exceed it only beyond ~32,000 km
+_INT16_MAX = np.iinfo(np.int16).max
+
+_memory_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+def _fingerprint(lat: np.ndarray, lon: np.ndarray, service: np.ndarray, avg_speed_kmh: float) -> str:
+    """
+    Hash everything the matrix depends on: coordinates, service times and speed.
+
+    Args:
+        lat: Site latitudes in matrix order (depot first, if applicable)
+        lon: Site longitudes in matrix order
+        service: Site service minutes in matrix order
+        avg_speed_kmh: Average travel speed in km/h
+
+    Returns:
+        Hex digest identifying the matrix
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(lat.tobytes())
+    digest.update(lon.tobytes())
+    digest.update(service.astype(np.int64).tobytes())
+    digest.update(np.float64(avg_speed_kmh).tobytes())
+    return digest.hexdigest()
+
+
+def _compact(matrix: np.ndarray) -> np.ndarray:
+    """Narrow an int32 matrix to int16 when every value fits, halving its size."""
+    if matrix.size == 0 or matrix.max() <= _INT16_MAX:
+        return matrix.astype(np.int16)
+    return matrix
+
+
+def get_or_build_matrix(
+    sites: List[Site],
+    avg_speed_kmh: float = 60.0,
+    cache_dir: Optional[Path] = None
+) -> List[List[int]]:
+    """
+    Return the travel-time matrix for sites, building it only on a cache miss.
+
+    Args:
+        sites: Sites in matrix order (depot first, if applicable)
+        avg_speed_kmh: Average travel speed in km/h
+        cache_dir: Optional directory for persistent tt_<hash>.npy files
+
+    Returns:
+        Distance matrix in minutes (2D list)
+    """
+    return get_or_build_matrix_array(sites, avg_speed_kmh, cache_dir).tolist()
+
+
+def get_or_build_matrix_array(
+    sites: List[Site],
+    avg_speed_kmh: float = 60.0,
+    cache_dir: Optional[Path] = None
+) -> np.ndarray:
+    """
+    Return the travel-time matrix as a read-only (N, N) integer array.
+
+    The array is shared with the cache, so it is marked read-only.
+
+    Args:
+        sites: Sites in matrix order (depot first, if applicable)
+        avg_speed_kmh: Average travel speed in km/h
+        cache_dir: Optional directory for persistent tt_<hash>.npy files
+
+    Returns:
+        Distance matrix in minutes as an int16 array (int32 if values don't fit)
+    """
+    lat, lon, service = site_arrays(sites)
+    key = _fingerprint(lat, lon, service, avg_speed_kmh)
+
+    with _memory_lock:
+        matrix = _memory_cache.get(key)
+        if matrix is not None:
+            _memory_cache.move_to_end(key)
+            return matrix
+
+    matrix_file = Path(cache_dir) / f"tt_{key}.npy" if cache_dir is not None else None
+    matrix = _load_matrix_file(matrix_file) if matrix_file is not None else None
+    if matrix is None:
+        matrix = _compact(travel_time_array_from_arrays(lat, lon, service, avg_speed_kmh))
+        matrix.flags.writeable = False
+        if matrix_file is not None:
+            _store_matrix_file(matrix_file, matrix)
+
+    with _memory_lock:
+        _memory_cache[key] = matrix
+        _memory_cache.move_to_end(key)
+        while len(_memory_cache) > _MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+
+    return matrix
+
+
+def _load_matrix_file(matrix_file: Path) -> Optional[np.ndarray]:
+    """
+    Memory-map a cached matrix file, marking it as recently used.
+
+    Args:
+        matrix_file: Path to a tt_<hash>.npy file
+
+    Returns:
+        The read-only matrix, or None on a miss or unreadable file
+    """
+    try:
+        matrix = np.load(matrix_file, mmap_mode="r")
+    except FileNotFoundError:
+        return None
+    except (ValueError, OSError) as e:
+        logger.warning("Ignoring unreadable cached matrix %s: %s", matrix_file, e)
+        return None
+    os.utime(matrix_file)
+    return matrix
+
+
+def _store_matrix_file(matrix_file: Path, matrix: np.ndarray) -> None:
+    """
+    Save a matrix file and evict the least recently used files beyond the limit.
+
+    Args:
+        matrix_file: Path to write the tt_<hash>.npy file to
+        matrix: Matrix to save
+    """
+    cache_dir = matrix_file.parent
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    # Write then rename so concurrent readers never map a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, matrix)
+        os.replace(tmp_path, matrix_file)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+    entries = list(cache_dir.glob("tt_*.npy"))
+    if len(entries) > MAX_CACHED_MATRICES:
+        entries.sort(key=lambda p: p.stat().st_mtime)
+        for stale in entries[:len(entries) - MAX_CACHED_MATRICES]:
+            stale.unlink(missing_ok=True)
+
+
+def clear_matrix_cache() -> None:
+    """Drop all in-process cached matrices (persistent .npy files are kept)."""
+    with _memory_lock:
+        _memory_cache.clear()
@@ -0,0 +1,84 @@
+"""In-process cache of solved routes used to warm-start re-planning.
+
+Iterative workflows re-solve the same single-day problem with small changes
+(fast mode, start date). plan_single_day_vrp seeds OR-Tools with the last routes
+solved for that problem, so the search starts from a working solution instead
+of building a first solution from scratch.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+from ..models import Site
+
+# Route sets kept per process
+_ROUTES_CACHE_SIZE = 64
+
+_routes_cache: "OrderedDict[str, List[List[int]]]" = OrderedDict()
+_routes_lock = threading.Lock()
+
+
+def routes_key(
+    sites: List[Site],
+    num_vehicles: int,
+    max_route_minutes: int,
+    break_minutes: int
+) -> str:
+    """
+    Identify a routing problem by its ordered site ids, vehicles and route limits.
+
+    Args:
+        sites: Sites in solver order (depot first)
+        num_vehicles: Number of vehicles available
+        max_route_minutes: Maximum route length in minutes
+        break_minutes: Break time taken on each route
+
+    Returns:
+        Hex digest identifying the problem
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{num_vehicles}:{max_route_minutes}:{break_minutes}".encode())
+    for site in sites:
+        digest.update(b"\x00")
+        digest.update(site.id.encode())
+    return digest.hexdigest()
+
+
+def get_cached_routes(key: str) -> Optional[List[List[int]]]:
+    """
+    Get the last routes solved for a problem.
+
+    Args:
+        key: Problem key from routes_key()
+
+    Returns:
+        Node indices per vehicle (depot excluded), or None if not cached
+    """
+    with _routes_lock:
+        routes = _routes_cache.get(key)
+        if routes is not None:
+            _routes_cache.move_to_end(key)
+        return routes
+
+
+def store_routes(key: str, routes: List[List[int]]) -> None:
+    """
+    Remember the routes solved for a problem.
+
+    Args:
+        key: Problem key from routes_key()
+        routes: Node indices per vehicle (depot excluded)
+    """
+    with _routes_lock:
+        _routes_cache[key] = routes
+        _routes_cache.move_to_end(key)
+        while len(_routes_cache) > _ROUTES_CACHE_SIZE:
+            _routes_cache.popitem(last=False)
+
+
+def clear_routes_cache() -> None:
+    """Drop all cached routes."""
+    with _routes_lock:
+        _routes_cache.clear()
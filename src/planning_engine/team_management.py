@@ -36,6 +36,22 @@ def get_teams_csv_path(workspace_name: str, state_abbr: str) -> Path:
     return teams_csv
 
 
+def _text_or_default(column: pd.Series, default: Optional[str]) -> pd.Series:
+    """Convert present values to strings and missing ones to default.
+    
+    Args:
+        column: Column read from teams.csv
+        default: Value for missing cells
+        
+    Returns:
+        Object column of strings and default
+    """
+    present = column.notna()
+    text = column.astype(object)
+    text[present] = column[present].map(str)
+    return text.where(present, default)
+
+
 def load_teams(workspace_name: str, state_abbr: str) -> List[Team]:
     """Load all teams for a workspace and state.
     
@@ -67,48 +83,37 @@ def load_teams(workspace_name: str, state_abbr: str) -> List[Team]:
         if df.empty:
             return []
         
-        # Convert DataFrame to list of Team objects
-        teams = []
-        for _, row in df.iterrows():
-            team_data = row.to_dict()
-            
-            # Convert team_id to string (pandas may read it as int)
-            if 'team_id' in team_data:
-                team_data['team_id'] = str(team_data['team_id'])
-            
-            # Handle date fields
-            for date_field in ['availability_start', 'availability_end', 'created_date']:
-                if date_field in team_data and pd.notna(team_data[date_field]):
-                    try:
-                        team_data[date_field] = pd.to_datetime(team_data[date_field]).date()
-                    except:
-                        team_data[date_field] = None
-                else:
-                    team_data[date_field] = None
-            
-            # Handle assigned_clusters (can be null)
-            if 'assigned_clusters' in team_data and pd.notna(team_data['assigned_clusters']):
-                team_data['assigned_clusters'] = str(team_data['assigned_clusters'])
+        # Normalize whole columns at once, then build Team objects
+        
+        # Convert team_id to string (pandas may read it as int)
+        if 'team_id' in df.columns:
+            df['team_id'] = df['team_id'].astype(str)
+        
+        # Handle date fields (unparseable dates become None)
+        for date_field in ['availability_start', 'availability_end', 'created_date']:
+            if date_field in df.columns:
+                parsed = pd.to_datetime(df[date_field], errors='coerce', format='mixed')
+                df[date_field] = parsed.dt.date.astype(object).where(parsed.notna(), None)
             else:
-                team_data['assigned_clusters'] = None
-            
-            # Handle optional string fields - convert to string if present, None if missing
-            for field in ['contact_name', 'contact_phone', 'contact_email']:
-                if field in team_data:
-                    if pd.isna(team_data[field]):
-                        team_data[field] = None
-                    else:
-                        # Convert to string (handles case where pandas reads phone as int)
-                        team_data[field] = str(team_data[field])
-            
-            # Handle notes field - always a string, never None
-            if 'notes' in team_data:
-                if pd.isna(team_data['notes']):
-                    team_data['notes'] = ""
-                else:
-                    team_data['notes'] = str(team_data['notes'])
-            
-            teams.append(Team(**team_data))
+                df[date_field] = None
+        
+        # Handle assigned_clusters (can be null)
+        if 'assigned_clusters' in df.columns:
+            df['assigned_clusters'] = _text_or_default(df['assigned_clusters'], None)
+        else:
+            df['assigned_clusters'] = None
+        
+        # Handle optional string fields - convert to string if present, None if missing
+        # (handles case where pandas reads phone as int)
+        for field in ['contact_name', 'contact_phone', 'contact_email']:
+            if field in df.columns:
+                df[field] = _text_or_default(df[field], None)
+        
+        # Handle notes field - always a string, never None
+        if 'notes' in df.columns:
+            df['notes'] = _text_or_default(df['notes'], "")
+        
+        teams = [Team(**record) for record in df.to_dict(orient='records')]
         
         logger.info(f"load_teams: successfully loaded {len(teams)} teams")
         return teams
@@ -149,7 +154,7 @@ def save_teams(workspace_name: str, state_abbr: str, teams: List[Team]) -> Path:
         ])
     else:
         # Convert teams to DataFrame
-        team_dicts = [team.model_dump() for team in teams]
+        team_dicts = [team.model_dump(mode='json') for team in teams]
         df = pd.DataFrame(team_dicts)
     
     # Save to CSV
@@ -0,0 +1,112 @@
+"""Offline tuning of OR-Tools search parameters per problem-size bucket.
+
+Runs every candidate combination of first-solution strategy, local search
+metaheuristic and time limit on representative synthetic instances, and writes
+the best combination for each (site count, crew count) bucket to
+planning_engine/solver/tuned_params.json, which solve_single_day_vrptw picks up
+automatically outside fast_mode.
+
+Usage:
+    python src/scripts/tune_search_params.py [--seeds 3]
+"""
+
+import argparse
+import itertools
+import json
+import random
+import time
+from datetime import time as dtime
+
+from planning_engine.core.depot import create_virtual_depot
+from planning_engine.models import PlanRequest, Site, TeamConfig, Workday
+from planning_engine.solver.ortools_solver import solve_single_day_vrptw, _solution_score
+from planning_engine.solver.search_tuning import TUNED_PARAMS_FILE, bucket_key
+from planning_engine.solver.solver_utils import prepare_sites_with_indices, calculate_distance_matrix
+
+# Representative workloads: (number of sites, number of crews)
+WORKLOADS = [(20, 1), (40, 2), (80, 2), (80, 4), (150, 4), (150, 8), (300, 8)]
+
+FIRST_SOLUTION_STRATEGIES = ["PARALLEL_CHEAPEST_INSERTION", "PATH_CHEAPEST_ARC", "SAVINGS", "CHRISTOFIDES"]
+METAHEURISTICS = ["GUIDED_LOCAL_SEARCH", "SIMULATED_ANNEALING", "TABU_SEARCH"]
+TIME_LIMITS = [5, 15]
+
+# Metro-area centers used to scatter synthetic sites
+CENTERS = [(30.0, -90.1), (35.8, -78.6), (38.6, -90.2)]
+
+
+def _synthetic_sites(num_sites: int, seed: int):
+    """Scatter sites within roughly 30 miles of a metro center."""
+    rng = random.Random(seed)
+    lat0, lon0 = CENTERS[seed % len(CENTERS)]
+    return [
+        Site(id=str(i), name=f"Site {i}", lat=lat0 + rng.uniform(-0.4, 0.4), lon=lon0 + rng.uniform(-0.4, 0.4))
+        for i in range(num_sites)
+    ]
+
+
+def tune_workload(num_sites: int, num_crews: int, seeds: int) -> dict:
+    """
+    Find the best search parameter overrides for one workload.
+
+    Args:
+        num_sites: Number of sites per instance
+        num_crews: Number of crews available
+        seeds: Number of random instances to average over
+
+    Returns:
+        Winning overrides dict
+    """
+    request = PlanRequest(
+        workspace="tuning",
+        team_config=TeamConfig(teams=num_crews, workday=Workday(start=dtime(8), end=dtime(17))),
+        max_route_minutes=480,
+    )
+    instances = []
+    for seed in range(seeds):
+        sites = _synthetic_sites(num_sites, seed)
+        sites_with_depot = prepare_sites_with_indices(sites, create_virtual_depot(sites))
+        instances.append((sites_with_depot, calculate_distance_matrix(sites_with_depot)))
+
+    results = []
+    for strategy, metaheuristic, time_limit in itertools.product(
+        FIRST_SOLUTION_STRATEGIES, METAHEURISTICS, TIME_LIMITS
+    ):
+        overrides = {
+            "first_solution_strategy": strategy,
+            "local_search_metaheuristic": metaheuristic,
+            "time_limit_seconds": time_limit,
+        }
+        unassigned = travel = 0
+        started = time.perf_counter()
+        for sites_with_depot, matrix in instances:
+            solution = solve_single_day_vrptw(sites_with_depot, request, matrix, search_overrides=overrides)
+            u, t = _solution_score(solution)
+            unassigned += u
+            travel += t
+        elapsed = time.perf_counter() - started
+        print(f"  {strategy:28s} {metaheuristic:20s} {time_limit:3d}s -> "
+              f"unassigned={unassigned}, travel={travel}, wall={elapsed:.1f}s")
+        results.append(((unassigned, travel, time_limit), overrides))
+
+    return min(results, key=lambda result: result[0])[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seeds", type=int, default=3, help="Random instances per workload")
+    args = parser.parse_args()
+
+    tuned = {}
+    for num_sites, num_crews in WORKLOADS:
+        key = bucket_key(num_sites, num_crews)
+        print(f"Tuning {key} ({num_sites} sites, {num_crews} crews)...")
+        tuned[key] = tune_workload(num_sites, num_crews, args.seeds)
+        print(f"✓ {key}: {tuned[key]}")
+
+    with open(TUNED_PARAMS_FILE, "w") as f:
+        json.dump(tuned, f, indent=2)
+    print(f"✓ Tuned parameters saved to: {TUNED_PARAMS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Tests for the travel-time matrix used by the OR-Tools solver."""
+
+from math import radians, sin, cos, sqrt, atan2
+
+import numpy as np
+
+from planning_engine.models import Site
+from planning_engine.solver.solver_utils import calculate_distance_matrix
+
+
+def _reference_minutes(a: Site, b: Site, avg_speed_kmh: float = 60.0) -> int:
+    """Per-pair haversine travel time plus service at the destination"""
+    dlat = radians(b.lat) - radians(a.lat)
+    dlon = radians(b.lon) - radians(a.lon)
+    h = sin(dlat / 2) ** 2 + cos(radians(a.lat)) * cos(radians(b.lat)) * sin(dlon / 2) ** 2
+    dist_km = 6371 * 2 * atan2(sqrt(h), sqrt(1 - h))
+    return int((dist_km / avg_speed_kmh) * 60) + b.service_minutes
+
+
+def test_distance_matrix_matches_per_pair_haversine():
+    """Test that every off-diagonal entry is travel minutes plus destination service time"""
+    # GIVEN: Sites spread across a metro area with different service times
+    sites = [
+        Site(id="A", name="Site A", lat=38.6270, lon=-90.1994, service_minutes=60),
+        Site(id="B", name="Site B", lat=38.6400, lon=-90.2500, service_minutes=45),
+        Site(id="C", name="Site C", lat=39.0997, lon=-94.5786, service_minutes=30),
+    ]
+
+    # WHEN: We build the matrix
+    matrix = calculate_distance_matrix(sites)
+
+    # THEN: It is a square list of int lists with a zero diagonal
+    assert len(matrix) == 3 and all(len(row) == 3 for row in matrix)
+    assert all(isinstance(value, int) for row in matrix for value in row)
+    assert [matrix[i][i] for i in range(3)] == [0, 0, 0]
+
+    # AND: Off-diagonal entries match the per-pair calculation
+    for i, a in enumerate(sites):
+        for j, b in enumerate(sites):
+            if i != j:
+                assert matrix[i][j] == _reference_minutes(a, b)
+
+
+def test_distance_matrix_empty():
+    """Test that no sites produce an empty matrix"""
+    assert calculate_distance_matrix([]) == []
+
+
+def test_distance_matrix_reused_from_memory_and_disk(tmp_path):
+    """Test that a matrix is cached in memory and persisted for other processes"""
+    from planning_engine.solver.travel_matrix_cache import clear_matrix_cache, get_or_build_matrix_array
+
+    sites = [
+        Site(id="A", name="Site A", lat=38.6270, lon=-90.1994, service_minutes=60),
+        Site(id="B", name="Site B", lat=38.6400, lon=-90.2500, service_minutes=60),
+    ]
+
+    # WHEN: The same sites are requested twice
+    first = calculate_distance_matrix(sites, cache_dir=tmp_path)
+    second = calculate_distance_matrix(sites, cache_dir=tmp_path)
+
+    # THEN: The second call returns the same matrix and one .npy file is written
+    assert second == first
+    assert len(list(tmp_path.glob("tt_*.npy"))) == 1
+
+    # AND: The cached array is shared, compact and read-only
+    cached = get_or_build_matrix_array(sites, cache_dir=tmp_path)
+    assert cached is get_or_build_matrix_array(sites, cache_dir=tmp_path)
+    assert cached.dtype == np.int16 and not cached.flags.writeable
+
+    # AND: After clearing memory, the matrix is reloaded from disk unchanged
+    clear_matrix_cache()
+    assert calculate_distance_matrix(sites, cache_dir=tmp_path) == first
+
+    # AND: Changing a service time produces a different matrix
+    changed = [sites[0], sites[1].model_copy(update={"service_minutes": 30})]
+    assert calculate_distance_matrix(changed)[0][1] == first[0][1] - 30
+
+
+def test_matrix_cache_rebuilds_corrupt_files_and_caps_file_count(tmp_path, monkeypatch):
+    """Test that unreadable .npy files are rebuilt and old files are evicted"""
+    from planning_engine.solver import travel_matrix_cache
+    from planning_engine.solver.travel_matrix_cache import clear_matrix_cache
+
+    sites = [
+        Site(id="A", name="Site A", lat=38.6270, lon=-90.1994, service_minutes=60),
+        Site(id="B", name="Site B", lat=38.6400, lon=-90.2500, service_minutes=60),
+    ]
+    clear_matrix_cache()
+    expected = calculate_distance_matrix(sites, cache_dir=tmp_path)
+
+    # GIVEN: The persisted matrix file was truncated
+    matrix_file = next(tmp_path.glob("tt_*.npy"))
+    matrix_file.write_bytes(matrix_file.read_bytes()[:20])
+    clear_matrix_cache()
+
+    # WHEN: The matrix is requested again
+    # THEN: It is rebuilt and the file is rewritten
+    assert calculate_distance_matrix(sites, cache_dir=tmp_path) == expected
+    clear_matrix_cache()
+    assert calculate_distance_matrix(sites, cache_dir=tmp_path) == expected
+
+    # AND: Only the newest files are kept once the limit is exceeded
+    monkeypatch.setattr(travel_matrix_cache, "MAX_CACHED_MATRICES", 2)
+    for minutes in (10, 20, 30):
+        calculate_distance_matrix([sites[0].model_copy(update={"service_minutes": minutes})], cache_dir=tmp_path)
+    assert len(list(tmp_path.glob("tt_*.npy"))) == 2
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_depot_matrix_sliced_from_all_sites_matches_full_build():
+    """Test that slicing a day's matrix gives the same values as building it from scratch"""
+    import random
+    from planning_engine.core.depot import create_virtual_depot
+    from planning_engine.solver.solver_utils import (
+        prepare_sites_with_indices, site_distance_matrix, depot_distance_matrix
+    )
+
+    # GIVEN: A matrix over all sites and a shrunken subset with its own centroid depot
+    rng = random.Random(7)
+    sites = [
+        Site(id=str(i), name=f"Site {i}", lat=38.6 + rng.uniform(-0.5, 0.5),
+             lon=-90.2 + rng.uniform(-0.5, 0.5), service_minutes=rng.choice([30, 45, 60]))
+        for i in range(40)
+    ]
+    site_matrix, row_of = site_distance_matrix(sites)
+    remaining = sites[5::3]
+    depot = create_virtual_depot(remaining)
+
+    # WHEN: We slice the day's matrix
+    sliced = depot_distance_matrix(site_matrix, row_of, remaining, depot)
+
+    # THEN: It equals the matrix built directly for depot + remaining sites
+    assert sliced.tolist() == calculate_distance_matrix(prepare_sites_with_indices(remaining, depot))
@@ -0,0 +1,139 @@
+"""Tests for the shared SQLite geocode cache."""
+
+from planning_engine.data_prep.geocode_cache import GeocodeCache
+
+
+def test_set_then_get_roundtrip(tmp_path):
+    """Test that a cached address is returned on lookup, ignoring case and whitespace"""
+    cache = GeocodeCache(tmp_path / "geocode_cache.db")
+
+    cache.set("123 Main St", "St Louis", "MO", 38.627, -90.199, zip_code="63101", formatted_address="123 Main St, St Louis, MO")
+
+    result = cache.get(" 123 main st ", "st louis", "mo", "63101")
+    assert result is not None
+    assert result['lat'] == 38.627
+    assert result['lon'] == -90.199
+    assert result['formatted'] == "123 Main St, St Louis, MO"
+
+    assert cache.get("999 Nowhere Rd", "St Louis", "MO", "63101") is None
+    cache.close()
+
+
+def test_set_existing_address_updates_coordinates(tmp_path):
+    """Test that re-caching an address updates it instead of failing"""
+    cache = GeocodeCache(tmp_path / "geocode_cache.db")
+
+    cache.set("123 Main St", "St Louis", "MO", 1.0, 2.0, zip_code="63101")
+    cache.set("123 Main St", "St Louis", "MO", 3.0, 4.0, zip_code="63101")
+
+    result = cache.get("123 Main St", "St Louis", "MO", "63101")
+    assert (result['lat'], result['lon']) == (3.0, 4.0)
+    assert cache.get_stats()['total_entries'] == 1
+    cache.close()
+
+
+def test_batch_get_returns_hits_and_misses(tmp_path):
+    """Test that batch_get maps every address hash to a result or None"""
+    cache = GeocodeCache(tmp_path / "geocode_cache.db")
+    cache.batch_set([
+        {'street': '1 A St', 'city': 'X', 'state': 'LA', 'zip': '70112', 'lat': 1.0, 'lon': 2.0},
+        {'street': '2 B St', 'city': 'Y', 'state': 'LA', 'zip': None, 'lat': 3.0, 'lon': 4.0},
+    ])
+
+    addresses = [
+        ('1 A St', 'X', 'LA', '70112'),
+        ('2 B St', 'Y', 'LA', None),
+        ('3 C St', 'Z', 'LA', None),
+    ]
+    results = cache.batch_get(addresses)
+
+    assert len(results) == 3
+    assert results[cache._hash_address(*addresses[0])]['lat'] == 1.0
+    assert results[cache._hash_address(*addresses[1])]['lon'] == 4.0
+    assert results[cache._hash_address(*addresses[2])] is None
+    cache.close()
+
+
+def test_cache_persists_across_instances(tmp_path):
+    """Test that data written by one cache instance is visible after reopening"""
+    db_path = tmp_path / "geocode_cache.db"
+    cache = GeocodeCache(db_path)
+    cache.set("123 Main St", "St Louis", "MO", 38.627, -90.199)
+    cache.close()
+
+    reopened = GeocodeCache(db_path)
+    assert reopened.get("123 Main St", "St Louis", "MO")['lat'] == 38.627
+    reopened.close()
+
+
+def test_wal_checkpoint_after_write_interval(tmp_path, monkeypatch):
+    """Test that the write counter resets once the checkpoint interval is reached"""
+    from planning_engine.data_prep import geocode_cache
+
+    monkeypatch.setattr(geocode_cache, "_CHECKPOINT_INTERVAL", 3)
+    cache = GeocodeCache(tmp_path / "geocode_cache.db")
+
+    cache.set("1 A St", "X", "LA", 1.0, 2.0)
+    cache.set("2 B St", "X", "LA", 1.0, 2.0)
+    assert cache._writes_since_checkpoint == 2
+
+    cache.set("3 C St", "X", "LA", 1.0, 2.0)
+    assert cache._writes_since_checkpoint == 0
+    assert cache.get_stats()['total_entries'] == 3
+    cache.close()
+
+
+def test_batch_get_touches_duplicate_addresses_once(tmp_path):
+    """Test that duplicate addresses in one batch are looked up a single time"""
+    cache = GeocodeCache(tmp_path / "geocode_cache.db")
+    cache.set("1 A St", "X", "LA", 1.0, 2.0)
+
+    results = cache.batch_get([("1 A St", "X", "LA", None)] * 5 + [("1 a st", "x", "la", None)])
+
+    assert len(results) == 1
+    assert cache.get_stats()['total_accesses'] == 2
+    cache.close()
+
+
+def test_connections_of_finished_threads_are_closed(tmp_path):
+    """Test that connections opened by threads that have exited are released"""
+    import sqlite3
+    import threading
+    import pytest
+
+    cache = GeocodeCache(tmp_path / "geocode_cache.db")
+    cache.set("1 A St", "X", "LA", 1.0, 2.0)
+    opened = []
+
+    def lookup():
+        cache.get("1 A St", "X", "LA")
+        opened.append(cache._local.conn)
+
+    # Each short-lived thread opens its own connection, like recycled server workers
+    for _ in range(5):
+        worker = threading.Thread(target=lookup)
+        worker.start()
+        worker.join()
+
+    # Only this thread's and the latest worker's connections are kept
+    assert len(cache._connections) == 2
+    for conn in opened[:-1]:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+    cache.close()
+
+
+def test_exit_cleanup_does_not_keep_cache_alive(tmp_path):
+    """Test that a cache registered for exit cleanup can still be garbage collected"""
+    import gc
+    import weakref
+    from planning_engine.data_prep import geocode_cache
+
+    cache = GeocodeCache(tmp_path / "geocode_cache.db")
+    assert cache in geocode_cache._open_caches
+
+    ref = weakref.ref(cache)
+    del cache
+    gc.collect()
+    assert ref() is None
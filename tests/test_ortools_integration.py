@@ -73,3 +73,282 @@ def test_plan_without_ortools_fallback():
     assert len(result.team_days) == 1
     assert result.team_days[0].team_id == 1
     assert set(result.team_days[0].site_ids) == {"A", "B"}
+
+
+def test_replanning_warm_starts_from_cached_routes(monkeypatch):
+    """Test that re-solving the same sites seeds the solver with the previous routes."""
+    from ortools.constraint_solver import pywrapcp
+    from planning_engine.solver.ortools_solver import plan_single_day_vrp
+    from planning_engine.solver.warm_start import clear_routes_cache
+
+    # GIVEN: A single-day request, an empty route cache and a spy on route seeding
+    clear_routes_cache()
+    seeded_routes = []
+    read_assignment = pywrapcp.RoutingModel.ReadAssignmentFromRoutes
+
+    def spy(self, routes, ignore_inactive_indices):
+        seeded_routes.append([list(route) for route in routes])
+        return read_assignment(self, routes, ignore_inactive_indices)
+
+    monkeypatch.setattr(pywrapcp.RoutingModel, "ReadAssignmentFromRoutes", spy)
+    req = PlanRequest(
+        workspace="test_workspace",
+        sites=[
+            Site(id="A", name="Site A", lat=38.6270, lon=-90.1994, service_minutes=60),
+            Site(id="B", name="Site B", lat=38.6400, lon=-90.2500, service_minutes=60),
+            Site(id="C", name="Site C", lat=38.6500, lon=-90.2000, service_minutes=60),
+        ],
+        team_config=TeamConfig(teams=1, workday=Workday(start=time(hour=8), end=time(hour=17))),
+        fast_mode=True
+    )
+
+    # WHEN: We plan the same request twice
+    first = plan_single_day_vrp(req)
+    assert seeded_routes == []
+    second = plan_single_day_vrp(req)
+
+    # THEN: The second solve started from the first plan's routes
+    assert len(seeded_routes) == 1
+    assert sorted(node for route in seeded_routes[0] for node in route) == [1, 2, 3]
+
+    # AND: The warm-started solve schedules the same sites
+    assert sorted(first.team_days[0].site_ids) == sorted(second.team_days[0].site_ids) == ["A", "B", "C"]
+    assert second.unassigned == 0
+
+    # AND: Changing the route limits does not reuse those routes
+    plan_single_day_vrp(req.model_copy(update={"max_route_minutes": 400}))
+    assert len(seeded_routes) == 1
+
+
+def test_portfolio_solve_keeps_best_variant(monkeypatch):
+    """Test that the strategy portfolio races variants and returns a full solution."""
+    from planning_engine.solver import ortools_solver
+    from planning_engine.core.depot import create_virtual_depot
+    from planning_engine.solver.solver_utils import prepare_sites_with_indices, calculate_distance_matrix
+
+    # GIVEN: Two CPUs and a small single-day problem
+    monkeypatch.setattr(ortools_solver.os, "cpu_count", lambda: 2)
+    monkeypatch.setattr(ortools_solver, "PORTFOLIO_VARIANTS", ortools_solver.PORTFOLIO_VARIANTS[:2])
+    sites = [
+        Site(id="A", name="Site A", lat=38.6270, lon=-90.1994, service_minutes=60),
+        Site(id="B", name="Site B", lat=38.6400, lon=-90.2500, service_minutes=60),
+        Site(id="C", name="Site C", lat=38.6500, lon=-90.2000, service_minutes=60),
+    ]
+    sites_with_depot = prepare_sites_with_indices(sites, create_virtual_depot(sites))
+    req = PlanRequest(
+        workspace="test_workspace",
+        sites=sites,
+        team_config=TeamConfig(teams=1, workday=Workday(start=time(hour=8), end=time(hour=17))),
+    )
+
+    # WHEN: We solve with the portfolio
+    solution = ortools_solver.solve_single_day_vrptw_portfolio(
+        sites_with_depot, req, calculate_distance_matrix(sites_with_depot)
+    )
+
+    # THEN: Every site is scheduled
+    assert solution["unassigned"] == 0
+    assert solution["total_sites_scheduled"] == 3
+
+
+def test_portfolio_falls_back_when_workers_fail(monkeypatch):
+    """Test that a broken portfolio pool falls back to a single in-process solve."""
+    from concurrent.futures import Future
+    from concurrent.futures.process import BrokenProcessPool
+    from planning_engine.solver import ortools_solver
+    from planning_engine.core.depot import create_virtual_depot
+    from planning_engine.solver.solver_utils import prepare_sites_with_indices, calculate_distance_matrix
+
+    class BrokenExecutor:
+        def submit(self, *args, **kwargs):
+            future = Future()
+            future.set_exception(BrokenProcessPool("worker died"))
+            return future
+
+    # GIVEN: Two CPUs and a pool whose workers have died
+    monkeypatch.setattr(ortools_solver.os, "cpu_count", lambda: 2)
+    monkeypatch.setattr(ortools_solver, "get_spawn_executor", lambda name, workers: BrokenExecutor())
+    sites = [
+        Site(id="A", name="Site A", lat=38.6270, lon=-90.1994, service_minutes=60),
+        Site(id="B", name="Site B", lat=38.6400, lon=-90.2500, service_minutes=60),
+    ]
+    sites_with_depot = prepare_sites_with_indices(sites, create_virtual_depot(sites))
+    req = PlanRequest(
+        workspace="test_workspace",
+        sites=sites,
+        team_config=TeamConfig(teams=1, workday=Workday(start=time(hour=8), end=time(hour=17))),
+    )
+
+    # WHEN: We solve with the portfolio
+    solution = ortools_solver.solve_single_day_vrptw_portfolio(
+        sites_with_depot, req, calculate_distance_matrix(sites_with_depot)
+    )
+
+    # THEN: The in-process fallback still schedules every site
+    assert solution["unassigned"] == 0
+    assert solution["total_sites_scheduled"] == 2
+
+
+def test_portfolio_pick_ignores_finishing_order(monkeypatch):
+    """Test that the portfolio picks by score, breaking ties by variant order."""
+    from concurrent.futures import Future
+    from planning_engine.solver import ortools_solver
+
+    def solution(name, unassigned, travel):
+        visits = [{"site": name, "site_index": 1, "travel_minutes": travel}]
+        return {"routes": [{"crew_id": 0, "visits": visits}], "unassigned": unassigned}
+
+    # GIVEN: Variants whose solutions tie on score, behind one with unassigned sites
+    results = iter([
+        solution("partial", 1, 5),
+        solution("first tie", 0, 30),
+        solution("second tie", 0, 30),
+    ])
+
+    class FinishedExecutor:
+        def submit(self, *args, **kwargs):
+            future = Future()
+            future.set_result(next(results))
+            return future
+
+    monkeypatch.setattr(ortools_solver.os, "cpu_count", lambda: 3)
+    monkeypatch.setattr(ortools_solver, "PORTFOLIO_VARIANTS", ortools_solver.PORTFOLIO_VARIANTS[:3])
+    monkeypatch.setattr(ortools_solver, "get_spawn_executor", lambda name, workers: FinishedExecutor())
+    sites = [
+        Site(id="A", name="Site A", lat=38.6270, lon=-90.1994, service_minutes=60),
+        Site(id="B", name="Site B", lat=38.6400, lon=-90.2500, service_minutes=60),
+    ]
+    req = PlanRequest(
+        workspace="test_workspace",
+        sites=sites,
+        team_config=TeamConfig(teams=1, workday=Workday(start=time(hour=8), end=time(hour=17))),
+    )
+
+    # WHEN: We solve with the portfolio
+    best = ortools_solver.solve_single_day_vrptw_portfolio(sites, req, [[0, 1], [1, 0]])
+
+    # THEN: The earliest-listed variant with the best score wins
+    assert best["routes"][0]["visits"][0]["site"] == "first tie"
+
+
+def test_single_day_plan_reused_from_solution_cache(tmp_path, monkeypatch):
+    """Test that re-planning identical inputs loads the cached plan instead of solving."""
+    from planning_engine.solver import ortools_solver, solver_utils
+
+    # GIVEN: A workspace cache directory and a single-day request
+    monkeypatch.setattr(solver_utils, "workspace_matrix_cache_dir", lambda workspace: tmp_path)
+    req = PlanRequest(
+        workspace="test_workspace",
+        sites=[
+            Site(id="A", name="Site A", lat=38.6270, lon=-90.1994, service_minutes=60),
+            Site(id="B", name="Site B", lat=38.6400, lon=-90.2500, service_minutes=60),
+        ],
+        team_config=TeamConfig(teams=1, workday=Workday(start=time(hour=8), end=time(hour=17))),
+        fast_mode=True
+    )
+    first = ortools_solver.plan_single_day_vrp(req)
+    assert len(list((tmp_path / "vrp").glob("*.json"))) == 1
+
+    # WHEN: We plan the same request again with the solver unavailable
+    def fail(*args, **kwargs):
+        raise AssertionError("solver should not run on a cache hit")
+    monkeypatch.setattr(ortools_solver, "solve_single_day_vrptw_portfolio", fail)
+    second = ortools_solver.plan_single_day_vrp(req)
+
+    # THEN: The cached plan is returned
+    assert second.team_days[0].site_ids == first.team_days[0].site_ids
+    assert second.unassigned == first.unassigned
+
+
+def test_solution_key_follows_search_configuration(monkeypatch):
+    """Test that re-tuning or changing portfolio variants invalidates cached plans."""
+    from planning_engine.solver import ortools_solver
+    from planning_engine.solver.solution_cache import solution_key
+
+    # GIVEN: A full-search request
+    sites = [
+        Site(id="A", name="Site A", lat=38.6270, lon=-90.1994, service_minutes=60),
+        Site(id="B", name="Site B", lat=38.6400, lon=-90.2500, service_minutes=60),
+    ]
+    req = PlanRequest(
+        workspace="test_workspace",
+        sites=sites,
+        team_config=TeamConfig(teams=1, workday=Workday(start=time(hour=8), end=time(hour=17))),
+    )
+
+    def key():
+        return solution_key(sites, req, ortools_solver._search_settings(len(sites) + 1, req))
+
+    # WHEN: The tuned overrides change on a single CPU
+    monkeypatch.setattr(ortools_solver.os, "cpu_count", lambda: 1)
+    monkeypatch.setattr(ortools_solver, "get_tuned_overrides", lambda sites, crews: None)
+    untuned = key()
+    monkeypatch.setattr(ortools_solver, "get_tuned_overrides", lambda sites, crews: {"first_solution_strategy": "SAVINGS"})
+
+    # THEN: The plan key changes
+    assert key() != untuned
+
+    # AND: With a portfolio, editing a variant or the time limit changes the key too
+    monkeypatch.setattr(ortools_solver.os, "cpu_count", lambda: 4)
+    portfolio = key()
+    monkeypatch.setattr(ortools_solver, "PORTFOLIO_VARIANTS", ortools_solver.PORTFOLIO_VARIANTS[:3])
+    assert key() != portfolio
+    trimmed = key()
+    monkeypatch.setattr(ortools_solver, "TIME_LIMIT_SECONDS", 30)
+    assert key() != trimmed
+
+
+def test_solve_accepts_explicit_warm_start_routes():
+    """Test that caller-provided routes seed the solve."""
+    from planning_engine.solver.ortools_solver import solve_single_day_vrptw
+    from planning_engine.core.depot import create_virtual_depot
+    from planning_engine.solver.solver_utils import prepare_sites_with_indices, calculate_distance_matrix
+
+    # GIVEN: Two sites
+    sites = [
+        Site(id="A", name="Site A", lat=38.6270, lon=-90.1994, service_minutes=60),
+        Site(id="B", name="Site B", lat=38.6400, lon=-90.2500, service_minutes=60),
+    ]
+    sites_with_depot = prepare_sites_with_indices(sites, create_virtual_depot(sites))
+    req = PlanRequest(
+        workspace="test_workspace",
+        sites=sites,
+        team_config=TeamConfig(teams=1, workday=Workday(start=time(hour=8), end=time(hour=17))),
+        fast_mode=True
+    )
+
+    # WHEN: We solve starting from a route that visits both sites
+    solution = solve_single_day_vrptw(
+        sites_with_depot, req, calculate_distance_matrix(sites_with_depot), warm_start_routes=[[1, 2]]
+    )
+
+    # THEN: Both sites are scheduled
+    assert solution["unassigned"] == 0
+    assert solution["total_sites_scheduled"] == 2
+
+
+def test_team_days_keep_sites_that_share_a_name():
+    """Test that visits resolve to their own site even when names repeat."""
+    from planning_engine.solver.ortools_solver import solve_single_day_vrptw, _convert_solution_to_team_days
+    from planning_engine.core.depot import create_virtual_depot
+    from planning_engine.solver.solver_utils import prepare_sites_with_indices, calculate_distance_matrix
+
+    # GIVEN: Two different sites with the same display name
+    sites = [
+        Site(id="A", name="Store", lat=38.6270, lon=-90.1994, service_minutes=60),
+        Site(id="B", name="Store", lat=38.6400, lon=-90.2500, service_minutes=60),
+    ]
+    sites_with_depot = prepare_sites_with_indices(sites, create_virtual_depot(sites))
+    req = PlanRequest(
+        workspace="test_workspace",
+        sites=sites,
+        team_config=TeamConfig(teams=1, workday=Workday(start=time(hour=8), end=time(hour=17))),
+        fast_mode=True
+    )
+
+    # WHEN: We solve and convert the solution to team-days
+    solution = solve_single_day_vrptw(sites_with_depot, req, calculate_distance_matrix(sites_with_depot))
+    team_days = _convert_solution_to_team_days(solution, sites_with_depot)
+
+    # THEN: Both sites are scheduled under their own ids
+    assert sorted(sid for td in team_days for sid in td.site_ids) == ["A", "B"]
@@ -25,3 +25,186 @@ def test_plan_counts_sites():
 
     # THEN: The result should have 1 team day
     assert result.team_days[0].team_id == 1
+
+
+def test_count_working_days_skips_weekends_and_holidays():
+    from datetime import date
+    from planning_engine.planning.calendar_planner import _count_working_days
+
+    # GIVEN: Two full weeks (Mon Jan 6 - Sun Jan 19, 2025) with one weekday and one weekend holiday
+    holidays = [date(2025, 1, 8), date(2025, 1, 11)]
+
+    # WHEN/THEN: Only the weekday holiday reduces the count, and the end date is inclusive
+    assert _count_working_days(date(2025, 1, 6), date(2025, 1, 19), holidays) == 9
+    assert _count_working_days(date(2025, 1, 6), date(2025, 1, 6), []) == 1
+    assert _count_working_days(date(2025, 1, 7), date(2025, 1, 6), []) == 0
+
+
+def test_fixed_calendar_searches_crew_counts_instead_of_scanning(monkeypatch):
+    from datetime import date
+    from planning_engine.models import CalendarPlanResult
+    from planning_engine.planning import calendar_planner, crew_planner
+
+    # GIVEN: A calendar that only 23 or more crews can meet
+    checked = []
+
+    def fake_feasibility(request, crews, planning_days, site_matrix, row_of, day_routes=None):
+        checked.append(crews)
+        return crews >= 23
+
+    def fake_plan_fixed_crews(request):
+        return CalendarPlanResult(
+            start_date=request.start_date, end_date=request.end_date, team_days=[],
+            unassigned=0, crews_used=request.team_config.teams, planning_days_used=5,
+        )
+
+    monkeypatch.setattr(calendar_planner, "_validate_calendar_feasibility", fake_feasibility)
+    monkeypatch.setattr(crew_planner, "plan_fixed_crews", fake_plan_fixed_crews)
+    req = PlanRequest(
+        workspace="test_workspace",
+        sites=[Site(id=str(i), name=f"Site {i}", lat=38.6 + i * 0.01, lon=-90.2) for i in range(20)],
+        team_config=TeamConfig(teams=1, workday=Workday(start=time(hour=8), end=time(hour=17))),
+        start_date=date(2025, 1, 6),
+        end_date=date(2025, 1, 10),
+    )
+
+    # WHEN: We plan the fixed calendar
+    result = calendar_planner.plan_fixed_calendar(req)
+
+    # THEN: The minimum crew count is found with far fewer checks than a linear scan
+    assert result.crews_used == 23
+    assert len(checked) < 12
+    assert len(checked) == len(set(checked))
+
+
+def test_renumber_team_ids_labels_cluster_team_days():
+    from datetime import date
+    from planning_engine.models import TeamDay
+    from planning_engine.planning.cluster_planner import _renumber_team_ids
+
+    # GIVEN: Calendar-mode team-days from two clusters that both used team 1
+    team_days = []
+    for cluster_id in (0, 1):
+        td = TeamDay(team_id=1, site_ids=[str(cluster_id)], service_minutes=60,
+                     travel_minutes=0, route_minutes=60, date=date(2025, 1, 6))
+        td._cluster_id = cluster_id
+        team_days.append(td)
+
+    # WHEN: We renumber team IDs
+    _renumber_team_ids(team_days, is_calendar_mode=True)
+
+    # THEN: Each team-day keeps its cluster for display and the temporary tag is cleared
+    assert [td.cluster_id for td in team_days] == [0, 1]
+    assert [td.team_label for td in team_days] == ["C1-T1", "C2-T1"]
+    assert all(td._cluster_id is None for td in team_days)
+
+
+def test_failed_cluster_cancels_queued_clusters(monkeypatch):
+    from concurrent.futures import Future
+    import pytest
+    from planning_engine.planning import cluster_planner
+
+    # GIVEN: A shared pool where the first cluster fails and the others are still queued
+    submitted = []
+
+    class QueuedExecutor:
+        def submit(self, fn, cluster_request):
+            future = Future()
+            if cluster_request.sites[0].id == "0":
+                future.set_exception(ValueError("cluster failed"))
+            submitted.append(future)
+            return future
+
+    monkeypatch.setattr(cluster_planner, "MAX_CLUSTER_WORKERS", 2)
+    monkeypatch.setattr(cluster_planner, "get_spawn_executor", lambda name, workers: QueuedExecutor())
+    cluster_requests = {
+        cluster_id: PlanRequest(
+            workspace="test_workspace",
+            sites=[Site(id=str(cluster_id), name=f"Site {cluster_id}", lat=38.6, lon=-90.2)],
+            team_config=TeamConfig(teams=1, workday=Workday(start=time(hour=8), end=time(hour=17))),
+        )
+        for cluster_id in range(3)
+    }
+
+    # WHEN: We plan the clusters in parallel
+    with pytest.raises(ValueError):
+        cluster_planner._plan_clusters_in_parallel(cluster_requests)
+
+    # THEN: The queued clusters are cancelled instead of left in the pool
+    assert sum(future.cancelled() for future in submitted) == 2
+
+
+def test_route_minutes_lower_bound_counts_service_and_cheapest_travel():
+    import numpy as np
+    from planning_engine.planning.calendar_planner import _min_travel_into_sites, _route_minutes_lower_bound
+
+    # GIVEN: Three 60-minute sites; entries include service at the destination
+    sites = [Site(id=str(i), name=f"Site {i}", lat=38.6, lon=-90.2, service_minutes=60) for i in range(3)]
+    site_matrix = np.array([
+        [0, 70, 90],
+        [65, 0, 80],
+        [100, 75, 0],
+    ])
+
+    # WHEN: We find the cheapest travel into each site
+    min_travel_in = _min_travel_into_sites(sites, site_matrix)
+
+    # THEN: It is travel only, sorted ascending
+    assert min_travel_in.tolist() == [5, 10, 20]
+
+    # AND: One route must drive into two sites from other sites; three routes need no travel
+    assert _route_minutes_lower_bound(180, min_travel_in, routes=1) == 195
+    assert _route_minutes_lower_bound(180, min_travel_in, routes=3) == 180
+
+
+def test_max_sites_per_route_fits_cheapest_service_and_travel():
+    import numpy as np
+    from planning_engine.planning.calendar_planner import _max_sites_per_route
+
+    # GIVEN: Three 60-minute sites with cheapest incoming trips of 5, 10 and 20 minutes
+    sites = [Site(id=str(i), name=f"Site {i}", lat=38.6, lon=-90.2, service_minutes=60) for i in range(3)]
+    min_travel_in = np.array([5, 10, 20])
+
+    # WHEN/THEN: Two sites need 125 minutes and three need 195
+    assert _max_sites_per_route(sites, min_travel_in, route_minutes=194) == 2
+    assert _max_sites_per_route(sites, min_travel_in, route_minutes=195) == 3
+    assert _max_sites_per_route(sites, min_travel_in, route_minutes=59) == 0
+
+
+def test_fixed_calendar_grows_crews_geometrically_when_full_plans_fail(monkeypatch):
+    from datetime import date
+    from planning_engine.models import CalendarPlanResult
+    from planning_engine.planning import calendar_planner, crew_planner
+
+    # GIVEN: Feasibility checks pass from 3 crews, but full plans only fit from 30 crews
+    planned = []
+
+    def fake_feasibility(request, crews, planning_days, site_matrix, row_of, day_routes=None):
+        return crews >= 3
+
+    def fake_plan_fixed_crews(request):
+        crews = request.team_config.teams
+        planned.append(crews)
+        if crews < 30:
+            raise RuntimeError("No progress possible")
+        return CalendarPlanResult(
+            start_date=request.start_date, end_date=request.end_date, team_days=[],
+            unassigned=0, crews_used=crews, planning_days_used=5,
+        )
+
+    monkeypatch.setattr(calendar_planner, "_validate_calendar_feasibility", fake_feasibility)
+    monkeypatch.setattr(crew_planner, "plan_fixed_crews", fake_plan_fixed_crews)
+    req = PlanRequest(
+        workspace="test_workspace",
+        sites=[Site(id=str(i), name=f"Site {i}", lat=38.6 + i * 0.01, lon=-90.2) for i in range(20)],
+        team_config=TeamConfig(teams=1, workday=Workday(start=time(hour=8), end=time(hour=17))),
+        start_date=date(2025, 1, 6),
+        end_date=date(2025, 1, 10),
+    )
+
+    # WHEN: We plan the fixed calendar
+    result = calendar_planner.plan_fixed_calendar(req)
+
+    # THEN: The fewest crews that fit is found without trying every count from 3 to 30
+    assert result.crews_used == 30
+    assert len(planned) < 12
@@ -85,3 +85,41 @@ def test_new_workspace_idempotent():
         # Cleanup
         if Path("data/workspace").exists():
             shutil.rmtree("data/workspace/" + workspace_name, ignore_errors=True)
+
+
+def test_project_root_scoped_per_username():
+    """Test that the cached project root still follows the username context"""
+    from planning_engine.paths import get_project_root, set_current_username, clear_current_username
+    
+    base = get_project_root()
+    try:
+        set_current_username("alice")
+        assert get_project_root() == base / "data" / "alice"
+        set_current_username("bob")
+        assert get_project_root() == base / "data" / "bob"
+    finally:
+        clear_current_username()
+    
+    assert get_project_root() == base
+
+
+def test_validate_workspace_tracks_workspace_on_disk():
+    """Test that validation follows a workspace being created and deleted"""
+    from planning_engine.core.workspace import validate_workspace
+    workspace_name = "test_validate_cached_456"
+    
+    try:
+        with pytest.raises(FileNotFoundError):
+            validate_workspace(workspace_name)
+        
+        workspace_path = new_workspace(workspace_name)
+        assert validate_workspace(workspace_name) == workspace_path
+        
+        shutil.rmtree(workspace_path)
+        with pytest.raises(FileNotFoundError):
+            validate_workspace(workspace_name)
+    
+    finally:
+        # Cleanup
+        if Path("data/workspace").exists():
+            shutil.rmtree("data/workspace/" + workspace_name, ignore_errors=True)